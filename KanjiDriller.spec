@@ -1,11 +1,15 @@
 # -*- mode: python ; coding: utf-8 -*-
+import subprocess
+import sys
 
+# Prebuild kanji.pkl so the bundled app skips parsing kanji.json at startup.
+subprocess.run([sys.executable, "-c", "import logic; logic.writeKanjiPickle()"], cwd=SPECPATH, check=True)
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('pfp.png', '.'), ('profile.json', '.'), ('kanji.json', '.'), ('C:\\Users\\rvazq\\Code_Projects\\Kanji-Driller\\.venv\\Lib\\site-packages\\PySide6\\plugins', 'PySide6\\plugins')],
+    datas=[('pfp.png', '.'), ('profile.json', '.'), ('kanji.json', '.'), ('C:\\Users\\rvazq\\Code_Projects\\Kanji-Driller\\.venv\\Lib\\site-packages\\PySide6\\plugins', 'PySide6\\plugins'), ('kanji.pkl', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
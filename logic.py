@@ -1,92 +1,340 @@
 # logic.py
 import pandas as pd
-import random
+import numpy as np
+import functools
+import itertools
+import math
+import numbers
+import weakref
 import os
 import sys
 import json
 from typing import Dict, Any
 
+_BASE_DIR = getattr(sys, "_MEIPASS", None) or os.path.abspath(".")
+
+
 def resource_path(relative_path: str) -> str:
-    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
-    return os.path.join(base, relative_path)
+    return os.path.join(_BASE_DIR, relative_path)
 
-data: Dict[str, Any]
 kanji_json_path = resource_path("kanji.json")
-try:
-    with open(kanji_json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        if not isinstance(data, dict):
-            data = {}
-except Exception:
-    data = {}
+kanji_pickle_path = resource_path("kanji.pkl")
 
 empty_df = pd.DataFrame()
+# one generator shared with the UI for every random draw
+rng = np.random.default_rng()
+
 
-if data:
+def _source_key():
     try:
-        df = pd.DataFrame.from_dict(data, orient="index").reset_index().rename(columns={"index": "kanji"})
-    except Exception:
-        df = empty_df
-else:
-    df = empty_df
+        st = os.stat(kanji_json_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
 
-def filterDataFrame(system, levels, drill):
 
-    if df is None or df.shape[0] == 0:
-        return empty_df
+_LIST_COLUMNS = (
+    "meanings", "readings_on", "readings_kun",
+    "wk_meanings", "wk_readings_on", "wk_readings_kun", "wk_radicals",
+)
 
+
+def _intern_items(value):
+    if not isinstance(value, list):
+        return value
+    return tuple(sys.intern(x) if isinstance(x, str) else x for x in value)
+
+
+def _intern_list_columns(frame):
+    for col in _LIST_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].map(_intern_items)
+    return frame
+
+
+def _load_json_frame():
+    data: Dict[str, Any]
     try:
-        if system == "JLPT":
-            if drill == "Meaning":
-                return df[
-                    (df.get("jlpt_new").isin(levels)) &
-                    (df.get("meanings").notna())
-                ]
-
-            elif drill == "Reading":
-                return df[
-                    (df.get("jlpt_new").isin(levels)) &
-                    (df.get("readings_on").notna()) &
-                    (df.get("readings_kun").notna())
-                ]
-
-        elif system == "WaniKani":
-            if drill == "Meaning":
-                return df[
-                    (df.get("wk_level").isin(levels)) &
-                    (df.get("wk_meanings").notna())
-                ]
-
-            elif drill == "Reading":
-                return df[
-                    (df.get("wk_level").isin(levels)) &
-                    (df.get("wk_readings_on").notna()) &
-                    (df.get("wk_readings_kun").notna())
-                ]
+        with open(kanji_json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
     except Exception:
-        return empty_df
+        data = {}
 
-    return empty_df
+    if not data:
+        return empty_df
+    try:
+        frame = pd.DataFrame.from_dict(data, orient="index").reset_index().rename(columns={"index": "kanji"})
+        return _intern_list_columns(frame)
+    except Exception:
+        return empty_df
 
 
-def getMaxCount(system, levels, drill):
-    filtered = filterDataFrame(system, levels, drill)
+def _load_pickled_frame():
+    if not os.path.exists(kanji_pickle_path):
+        return None
     try:
-        return int(filtered.shape[0])
+        frame = pd.read_pickle(kanji_pickle_path)
     except Exception:
+        return None
+    if not isinstance(frame, pd.DataFrame):
+        return None
+    # a bundled pickle was built from the bundled kanji.json
+    if getattr(sys, "frozen", False):
+        return frame
+    key = _source_key()
+    if key is not None and frame.attrs.get("source_key") != key:
+        return None
+    return frame
+
+
+def writeKanjiPickle(path=kanji_pickle_path):
+    frame = _load_json_frame().copy()
+    frame.attrs["source_key"] = _source_key()
+    frame.to_pickle(path)
+    return path
+
+
+df = _load_pickled_frame()
+if df is None:
+    df = _load_json_frame()
+
+
+_LEVEL_MISSING = -1
+_MAX_LEVELS = {"jlpt_new": 5, "wk_level": 60}
+
+_filter_columns = {
+    ("JLPT", "Meaning"): ("jlpt_new", ("meanings",)),
+    ("JLPT", "Reading"): ("jlpt_new", ("readings_on", "readings_kun")),
+    ("WaniKani", "Meaning"): ("wk_level", ("wk_meanings",)),
+    ("WaniKani", "Reading"): ("wk_level", ("wk_readings_on", "wk_readings_kun")),
+}
+
+
+def _notna_mask(*columns):
+    mask = np.ones(df.shape[0], dtype=bool)
+    for col in columns:
+        mask &= df[col].notna().to_numpy()
+    return mask
+
+
+def _level_array(column):
+    col = pd.to_numeric(df[column], errors="coerce")
+    col = col.where((col >= 0) & (col <= _MAX_LEVELS[column]))
+    return col.fillna(_LEVEL_MISSING).to_numpy().astype(np.int8)
+
+
+def _rows_by_level(level_name, mask_name):
+    level_arr = _columns[level_name]
+    rows = np.flatnonzero(_columns[mask_name] & (level_arr != _LEVEL_MISSING))
+    levels = level_arr[rows]
+    order = np.argsort(levels, kind="stable")
+    rows, levels = rows[order], levels[order]
+    bounds = np.searchsorted(levels, np.arange(_MAX_LEVELS[level_name] + 2))
+    by_level = {}
+    for lv in range(_MAX_LEVELS[level_name] + 1):
+        part = rows[bounds[lv]:bounds[lv + 1]]
+        part.setflags(write=False)
+        by_level[lv] = part
+    return by_level
+
+
+class LazyColumns:
+    def __init__(self):
+        self._builders = {}
+        self._values = {}
+
+    def register(self, name, builder):
+        self._builders[name] = builder
+
+    def __contains__(self, name):
+        return name in self._builders
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._builders[name]()
+            self._values[name] = value
+            return value
+
+
+_columns = LazyColumns()
+_filter_specs = {}
+for _key, (_level_name, _value_names) in _filter_columns.items():
+    if not all(c in df.columns for c in (_level_name, *_value_names)):
+        continue
+    _columns.register(_level_name, functools.partial(_level_array, _level_name))
+    _columns.register(("valid",) + _key, functools.partial(_notna_mask, *_value_names))
+    _columns.register(("by_level",) + _key, functools.partial(_rows_by_level, _level_name, ("valid",) + _key))
+    _filter_specs[_key] = ("by_level",) + _key
+
+
+def _levels_key(levels):
+    return tuple(sorted({
+        int(lv) for lv in (levels or ())
+        if isinstance(lv, numbers.Real) and float(lv).is_integer()
+    }))
+
+
+@functools.lru_cache(maxsize=64)
+def _filter_cached(system, drill, levels_key):
+    by_level = _columns[_filter_specs[(system, drill)]]
+    parts = [by_level[lv] for lv in levels_key if lv in by_level]
+    if not parts:
+        idx = np.empty(0, dtype=np.int64)
+    elif len(parts) == 1:
+        return parts[0]
+    else:
+        # keep df order so multi-level filters match a full-column scan
+        idx = np.sort(np.concatenate(parts))
+    idx.setflags(write=False)
+    return idx
+
+
+def _filter_indices(system, levels, drill):
+    if (system, drill) not in _filter_specs:
+        return None
+    return _filter_cached(system, drill, _levels_key(levels))
+
+
+def filterIndices(system, levels, drill):
+    idx = _filter_indices(system, levels, drill)
+    if idx is None:
+        return np.empty(0, dtype=np.int64)
+    return idx
+
+
+@functools.lru_cache(maxsize=8)
+def _filtered_frame(system, drill, levels_key):
+    return df.iloc[_filter_cached(system, drill, levels_key)]
+
+
+def filterDataFrame(system, levels, drill):
+    if (system, drill) not in _filter_specs:
+        return empty_df
+    return _filtered_frame(system, drill, _levels_key(levels))
+
+
+def getMaxCount(system, levels, drill):
+    idx = _filter_indices(system, levels, drill)
+    if idx is None:
         return 0
+    return int(len(idx))
 
 
-def getRandomSample(df_f, count):
+_FLOYD_RATIO = 10
+_PERMUTATION_RATIO = 2
+
+
+def _floyd_sample(n_pop, k):
+    selected = set()
+    for j in range(n_pop - k, n_pop):
+        t = int(rng.integers(0, j + 1))
+        selected.add(j if t in selected else t)
+    picks = np.fromiter(selected, dtype=np.int64, count=k)
+    rng.shuffle(picks)
+    return picks
+
+
+def _sample_positions(n_pop, k, exclude=None):
+    if exclude is not None:
+        # draw from the n_pop - 1 other positions, then step over the excluded one
+        picks = _sample_positions(n_pop - 1, k)
+        picks[picks >= exclude] += 1
+        return picks
+
+    if k * _FLOYD_RATIO < n_pop:
+        return _floyd_sample(n_pop, k)
+    if k * _PERMUTATION_RATIO >= n_pop:
+        return rng.permutation(n_pop)[:k]
+    return rng.choice(n_pop, size=k, replace=False)
+
+
+def getRandomIndices(df_f, count):
     if df_f is None or df_f.shape[0] == 0:
-        return df_f.iloc[0:0] if hasattr(df_f, "iloc") else empty_df
+        return np.empty(0, dtype=np.int64)
 
     n = int(count)
     if n <= 0:
-        return df_f.iloc[0:0]
+        return np.empty(0, dtype=np.int64)
 
     n = min(n, len(df_f))
-    return df_f.sample(n=n, random_state=None).reset_index(drop=True)
+    return _sample_positions(len(df_f), n)
+
+
+_UNIT_FLOOR = float(np.finfo(float).tiny)
+_SENTINEL = object()
+
+
+def _unit_random():
+    return max(float(rng.random()), _UNIT_FLOOR)
+
+
+def reservoirSample(iterable, k):
+    it = iter(iterable)
+    k = int(k)
+    if k <= 0:
+        return []
+
+    reservoir = list(itertools.islice(it, k))
+    if len(reservoir) == k:
+        # Algorithm L: jump straight to the next item that enters the reservoir
+        w = math.exp(math.log(_unit_random()) / k)
+        while w < 1.0:
+            skip = int(math.log(_unit_random()) / math.log1p(-w))
+            item = next(itertools.islice(it, skip, None), _SENTINEL)
+            if item is _SENTINEL:
+                break
+            reservoir[int(rng.integers(0, k))] = item
+            w *= math.exp(math.log(_unit_random()) / k)
+
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+def weightedSample(weights, k):
+    weights = np.maximum(np.asarray(weights, dtype=np.float64), _UNIT_FLOOR)
+    k = max(0, min(int(k), len(weights)))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    # Efraimidis-Spirakis keys: sorting by key is the order of successive
+    # weighted draws without replacement
+    u = np.maximum(rng.random(len(weights)), _UNIT_FLOOR)
+    keys = np.log(u) / weights
+    picks = np.argpartition(-keys, k - 1)[:k]
+    return picks[np.argsort(-keys[picks], kind="stable")]
+
+
+def getRowsAt(indices):
+    return df.iloc[indices]
+
+
+def getRandomSample(df_f, count):
+    if df_f is None or df_f.shape[0] == 0:
+        return df_f.iloc[0:0] if hasattr(df_f, "iloc") else empty_df
+
+    return df_f.iloc[getRandomIndices(df_f, count)]
+
+
+_split_cache: Dict[int, Dict[str, list]] = {}
+
+
+def _split_columns(frame):
+    key = id(frame)
+    cols = _split_cache.get(key)
+    if cols is None:
+        cols = {c: frame[c].tolist() for c in frame.columns}
+        _split_cache[key] = cols
+        weakref.finalize(frame, _split_cache.pop, key, None)
+    return cols
+
+
+def getColumns(df_s):
+    if df_s is None or df_s.shape[0] == 0:
+        return {}
+    return _split_columns(df_s)
 
 
 def getRow(df_s, index):
@@ -94,7 +342,7 @@ def getRow(df_s, index):
         raise IndexError("DataFrame is empty")
     if not (0 <= index < len(df_s)):
         raise IndexError(f"index {index} out of range (0..{len(df_s)-1})")
-    return df_s.iloc[index]
+    return {c: values[index] for c, values in _split_columns(df_s).items()}
 
 
 def getRandomRows(df_s, row, count):
@@ -104,16 +352,14 @@ def getRandomRows(df_s, row, count):
     if not (0 <= row < len(df_s)):
         raise IndexError(f"row {row} out of range (0..{len(df_s)-1})")
 
-    available_indices = list(df_s.index)
-    try:
-        available_indices.remove(df_s.index[row])
-    except ValueError:
-        pass
-
-    if count > len(available_indices):
+    n = len(df_s)
+    if count > n - 1:
         raise ValueError(
-            f"Requested {count} rows, but only {len(available_indices)} available"
+            f"Requested {count} rows, but only {n - 1} available"
         )
 
-    chosen_indices = random.sample(available_indices, count)
-    return df_s.loc[chosen_indices]
+    picks = _sample_positions(n, count, exclude=row)
+    # plain position arrays come back as position arrays
+    if isinstance(df_s, np.ndarray):
+        return df_s[picks]
+    return df_s.iloc[picks]
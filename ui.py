@@ -1,41 +1,133 @@
 import sys
 import os
+import re
 import json
 import shutil
-import random
+import functools
+import itertools
+from collections import OrderedDict, deque
 from typing import Optional
 from PySide6.QtWidgets import (
-    QApplication, QMessageBox, QGridLayout, QCheckBox, QComboBox, QSpinBox,
+    QApplication, QMessageBox, QGridLayout, QCheckBox, QComboBox, QSpinBox, QButtonGroup,
     QHBoxLayout, QSizePolicy, QMainWindow, QStackedWidget, QWidget, QPushButton,
-    QVBoxLayout, QLabel, QScrollArea, QFrame, QProgressBar, QFileDialog, QLineEdit,
-    QDoubleSpinBox
+    QVBoxLayout, QLabel, QFrame, QProgressBar, QFileDialog, QLineEdit,
+    QDoubleSpinBox, QListView
+)
+from PySide6.QtGui import QFont, QColor, QPixmap, QPixmapCache, QPainter, QTextOption, QIcon
+from PySide6.QtCore import (
+    Qt, QTimer, QPropertyAnimation, QParallelAnimationGroup, QPoint, QEasingCurve, QRect, QRectF, QSize,
+    QObject, QThread, Signal, Slot, QEvent, QAbstractListModel, QModelIndex
 )
-from PySide6.QtGui import QFont, QColor, QPixmap, QPainter, QTextOption, QIcon
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QParallelAnimationGroup, QPoint, QEasingCurve, QRect
 
 import time
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_BASE_DIR = getattr(sys, "_MEIPASS", None) or os.path.abspath(".")
+
+
+def _dump_json_bytes(obj) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dump_json_line(obj) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _load_json_file(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _write_atomic(path: str, data: bytes, supersedes: str = None):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    # drop the superseded log before the replace; a crash in between leaves a
+    # complete .tmp that _finish_atomic_write promotes on the next start
+    if supersedes:
+        try:
+            os.remove(supersedes)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            os.remove(tmp)
+            raise
+    os.replace(tmp, path)
+
+
+def _finish_atomic_write(path: str, log_path: str):
+    tmp = path + ".tmp"
+    if not os.path.exists(tmp):
+        return
+    try:
+        _load_json_file(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        return
+    try:
+        os.remove(log_path)
+    except OSError:
+        pass
+
+
+def _format_list(v):
+    if v is None:
+        return ""
+    try:
+        return ", ".join(str(x) for x in v if x is not None)
+    except TypeError:
+        return str(v)
+
+
+def _format_scalar(v):
+    return "" if v is None else str(v)
 
 try:
     from logic import (
         filterDataFrame,
+        filterIndices,
+        getRowsAt,
         getRandomSample,
+        weightedSample,
         getRandomRows,
         getMaxCount,
-        getRow
+        getRow,
+        getColumns,
+        reservoirSample,
     )
+    import logic
 except Exception as e:
     raise ImportError(f"Failed to import required functions from logic.py: {e}")
 
 
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
     """
     Return a path to a resource that works both bundled by PyInstaller (onefile)
     and in development.
     """
-    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
-    return os.path.join(base, relative_path)
+    return os.path.join(_BASE_DIR, relative_path)
 
 
+@functools.lru_cache(maxsize=None)
 def user_data_dir(app_name: str = "KanjiDriller") -> str:
     
     if sys.platform.startswith("win"):
@@ -50,35 +142,236 @@ def user_data_dir(app_name: str = "KanjiDriller") -> str:
     return path
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_bundled_pfp() -> Optional[str]:
+    try:
+        with os.scandir(resource_path(".")) as it:
+            files = {e.name.lower(): e.path for e in it if e.is_file()}
+    except OSError:
+        return None
+    return next((files[f"pfp.{ext}"] for ext in ("jpg", "png", "jpeg", "webp") if f"pfp.{ext}" in files), None)
+
+
+def _split_answer_parts(text):
+    if text is None:
+        return []
+    return [p for p in (p.strip() for p in str(text).lower().replace(";", ",").split(",")) if p]
+
+
+def _reading_fields(is_jlpt, prefer):
+    kun_field, on_field = ("readings_kun", "readings_on") if is_jlpt else ("wk_readings_kun", "wk_readings_on")
+    if prefer == "kunyomi":
+        return kun_field, on_field
+    return on_field, kun_field
+
+
+def _normalize_reading_list(val):
+    if val is None:
+        return []
+    if isinstance(val, (list, tuple)):
+        return [s for s in (str(x).strip() for x in val if x is not None) if s]
+    s = str(val).strip()
+    return [s] if s else []
+
+
+def _readings_text(first, second):
+    items = _normalize_reading_list(first) or _normalize_reading_list(second)
+    return ", ".join(items)
+
+
+_KANJI_RE = re.compile("[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff]")
+
+@functools.lru_cache(maxsize=256)
+def _subgroup_bounds(n, group_count):
+    sizes = np.full(group_count, n // group_count)
+    sizes[:n % group_count] += 1
+    ends = np.cumsum(sizes)
+    return tuple(zip((ends - sizes).tolist(), ends.tolist()))
+
+
+_PROFILE_DEFAULTS = {
+    "username": "User",
+    "xp": {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}},
+    "pw_question_counter": 0,
+    "pw_session_counter": 0,
+}
+
+_IMG_EXTS = frozenset({".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif"})
+
+_BUCKET_DEFAULTS = {
+    "right": 0,
+    "wrong": 0,
+    "streak": 0,
+    "pw_right": 0,
+    "pw_wrong": 0,
+    "pw_streak": 0,
+    "pw_last_seen": 0,
+    "pw_last_seen_session": 0,
+    "mastery": 0.0,
+    "mastery_streak": 0,
+    "mastery_last_seen": 0
+}
+
+
+def _coerce_counter(value, default):
+    try:
+        return type(default)(float(value or default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _normalize_counters(entry):
+    # older stats files may hold counters as strings or floats
+    entry["total_encounters"] = _coerce_counter(entry.get("total_encounters"), 0)
+    for sysn in ("JLPT", "WaniKani"):
+        for bucket in entry[sysn].values():
+            for field, default in _BUCKET_DEFAULTS.items():
+                bucket[field] = _coerce_counter(bucket.get(field), default)
+
+
+@functools.lru_cache(maxsize=256)
+def _bucket_level_progress(xp_value, xp_per_level=500):
+    level, within = divmod(xp_value, xp_per_level)
+    pct = within * 100 // xp_per_level
+    return level + 1, within, xp_per_level, pct
+
+
+class _Saver(QObject):
+    failed = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.written = {}
+        self.logs = {}
+
+    @Slot(str, object)
+    def write(self, path, data):
+        # a full write supersedes anything appended to the file's change log
+        try:
+            _write_atomic(path, data, self.logs.get(path))
+        except Exception:
+            self.failed.emit(path)
+            return
+        self.written[path] = hash(data)
+
+    @Slot(str, object)
+    def append(self, path, data):
+        try:
+            with open(path, "ab") as f:
+                f.write(data)
+        except Exception:
+            self.failed.emit(path)
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class _ResultsModel(QAbstractListModel):
+    _EMPTY_TEXT = "No wrong answers — great job!"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows) or 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self._rows:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._EMPTY_TEXT
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return int(Qt.AlignmentFlag.AlignCenter)
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            kanji, expected = self._rows[index.row()]
+            return f"{kanji:>3}   Expected: {expected}"
+        return None
+
+
 class WrapButton(QPushButton):
+    _PAD = 8
+
     def __init__(self, text: str = "", parent: Optional[QWidget] = None):
         super().__init__("", parent)
         self._wrap_text = str(text)
+        self._hover = False
+        self._opt = QTextOption(Qt.AlignCenter)
+        self._opt.setWrapMode(QTextOption.WordWrap)
+        self._text_rect = QRectF()
+        self._cached_pixmap: Optional[QPixmap] = None
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setText(text)
 
     def setText(self, text: str):
-        self._wrap_text = str(text)
-        super().setText(self._wrap_text)
+        text = str(text)
+        if text == self._wrap_text and self._cached_pixmap is not None:
+            return
+        self._wrap_text = text
+        self._cached_pixmap = None
+        super().setText(text)
+
+    def resizeEvent(self, event):
+        pad = self._PAD
+        self._text_rect = QRectF(self.rect().adjusted(pad, pad, -pad, -pad))
+        self._cached_pixmap = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.EnabledChange):
+            self._cached_pixmap = None
+        super().changeEvent(event)
+
+    def enterEvent(self, event):
+        self._hover = True
+        self.update()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self._hover = False
+        self.update()
+        super().leaveEvent(event)
+
+    def _text_pixmap(self):
+        dpr = self.devicePixelRatioF()
+        pix = self._cached_pixmap
+        if pix is not None and pix.devicePixelRatio() == dpr:
+            return pix
+        pix = QPixmap(self.size() * dpr)
+        pix.setDevicePixelRatio(dpr)
+        pix.fill(Qt.transparent)
+        painter = QPainter(pix)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(self.palette().buttonText().color())
+        painter.setFont(self.font())
+        painter.drawText(self._text_rect, self._wrap_text, self._opt)
+        painter.end()
+        self._cached_pixmap = pix
+        return pix
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
 
         r = self.rect()
-        painter.fillRect(r, self.palette().button())
-
-        painter.setPen(self.palette().buttonText().color())
-        painter.setFont(self.font())
+        palette = self.palette()
+        painter.fillRect(r, palette.button())
+        painter.drawPixmap(0, 0, self._text_pixmap())
 
-        pad = 8
-        text_rect = QRect(r.left() + pad, r.top() + pad, r.width() - pad * 2, r.height() - pad * 2)
-
-        flags = Qt.TextWordWrap | Qt.AlignCenter
-        painter.drawText(text_rect, int(flags), self._wrap_text)
-
-        if self.underMouse():
-            painter.setPen(self.palette().mid().color())
+        if self._hover:
+            painter.setPen(palette.mid().color())
             painter.drawRect(r.adjusted(0, 0, -1, -1))
 
         painter.end()
@@ -97,11 +390,39 @@ class ClickableLabel(QLabel):
             self._on_click()
         super().mousePressEvent(event)
 
+def _gray_to_green(t):
+    return QColor(int(200 + (0 - 200) * t), int(200 + (180 - 200) * t), int(200 + (0 - 200) * t))
+
+
+_HEAT_GRADIENT = [_gray_to_green(i / 255.0) for i in range(256)]
+_HOVER_BG = QColor(0, 0, 0, 191)
+_TODAY_HI = QColor(180, 210, 255)
+
+
+def _normalize_activity(act):
+    out = {}
+    if not isinstance(act, dict):
+        return out
+    for daykey, v in act.items():
+        try:
+            y, m, d = map(int, daykey.split("-"))
+            out[daykey] = {"questions": int((v or {}).get("questions", 0) or 0),
+                           "seconds": int((v or {}).get("seconds", 0) or 0)}
+        except Exception:
+            continue
+    return out
+
+
 class HeatmapDialog(QWidget):
     def __init__(self, parent=None, activity=None):
         super().__init__(parent, Qt.Window)
         self.setWindowTitle("Activity Heatmap")
         self.activity = activity or {}
+        self._index_activity()
+        self._cells = []
+        self._cache_pix = None
+        self._cache_key = None
+        self._cache_palette()
         self.setMinimumSize(720, 420)
 
         layout = QVBoxLayout(self)
@@ -113,11 +434,13 @@ class HeatmapDialog(QWidget):
         years = self._available_years()
         if not years:
             years = [int(time.strftime("%Y"))]
-        for y in sorted(years, reverse=True):
+        for y in reversed(years):
             self.year_combo.addItem(str(y))
 
         import calendar as _calendar
-        months = [("All", 0)] + [( _calendar.month_name[m], m) for m in range(1, 13)]
+        self._month_abbr = list(_calendar.month_abbr)
+        self._month_name = list(_calendar.month_name)
+        months = [("All", 0)] + [(self._month_name[m], m) for m in range(1, 13)]
         self.months = months
         for name, m in self.months:
             self.month_combo.addItem(name, m)
@@ -140,11 +463,20 @@ class HeatmapDialog(QWidget):
                 self.setMouseTracking(True)
 
             def paintEvent(self, ev):
+                pix = self.owner._heatmap_pixmap(self)
                 painter = QPainter(self)
-                try:
-                    self.owner._draw_heatmap(self, painter)
-                finally:
-                    painter.end()
+                dpr = pix.devicePixelRatio()
+                for r in ev.region():
+                    painter.drawPixmap(QRectF(r), pix, QRectF(r.x() * dpr, r.y() * dpr, r.width() * dpr, r.height() * dpr))
+                owner = self.owner
+                if owner._hover_text and ev.region().intersects(owner._hover_rect):
+                    painter.setRenderHint(QPainter.Antialiasing, True)
+                    painter.setPen(Qt.NoPen)
+                    painter.setBrush(_HOVER_BG)
+                    painter.drawRoundedRect(QRectF(owner._hover_rect), 4, 4)
+                    painter.setPen(Qt.white)
+                    painter.drawText(owner._hover_rect, Qt.AlignCenter, owner._hover_text)
+                painter.end()
 
             def mouseMoveEvent(self, ev):
                 self.owner._handle_mouse_move(self, ev.pos())
@@ -156,62 +488,82 @@ class HeatmapDialog(QWidget):
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         layout.addWidget(self.canvas)
 
-        self._hover_label = QLabel("", self.canvas)
-        self._hover_label.setStyleSheet("background: rgba(0,0,0,0.75); color: white; padding:4px; border-radius:4px;")
-        self._hover_label.hide()
-
-        self.year_combo.currentIndexChanged.connect(lambda _: self.canvas.update())
-        self.month_combo.currentIndexChanged.connect(lambda _: self.canvas.update())
+        self._hover_text = None
+        self._hover_rect = QRect()
+
+        self.year_combo.currentIndexChanged.connect(self._invalidate_heatmap)
+        self.month_combo.currentIndexChanged.connect(self._invalidate_heatmap)
+
+    def _cache_palette(self):
+        palette = self.palette()
+        self._pal_window = palette.window().color()
+        self._pal_mid = palette.mid().color()
+
+    def changeEvent(self, ev):
+        if ev.type() == QEvent.PaletteChange and hasattr(self, "canvas"):
+            self._cache_palette()
+            self._invalidate_heatmap()
+        super().changeEvent(ev)
+
+    def _invalidate_heatmap(self, *_):
+        self._cache_pix = None
+        self._hover_text = None
+        self.canvas.update()
+
+    def _heatmap_pixmap(self, canvas_widget):
+        dpr = canvas_widget.devicePixelRatioF()
+        key = (canvas_widget.width(), canvas_widget.height(), dpr,
+               self.year_combo.currentIndex(), self.month_combo.currentIndex())
+        if self._cache_pix is None or key != self._cache_key:
+            pix = QPixmap(canvas_widget.size() * dpr)
+            pix.setDevicePixelRatio(dpr)
+            painter = QPainter(pix)
+            try:
+                self._draw_heatmap(canvas_widget, painter)
+            finally:
+                painter.end()
+            self._cache_pix = pix
+            self._cache_key = key
+        return self._cache_pix
 
     def _available_years(self):
-        years = set()
-        for k in (self.activity or {}).keys():
-            try:
-                years.add(int(k[:4]))
-            except Exception:
-                pass
-        return sorted(years)
+        return self._years_sorted
+
+    def _index_activity(self):
+        by_ym = {}
+        for daykey, rec in self.activity.items():
+            y, m, d = map(int, daykey.split("-"))
+            by_ym.setdefault((y, m), {})[d] = rec
+        self._by_ym = by_ym
+        self._years_sorted = sorted({y for y, _ in by_ym})
 
     def _gather_month_map(self, year, month):
         data = {}
         if month == 0:
-            for daykey, v in (self.activity or {}).items():
-                try:
-                    y, m, d = daykey.split("-")
-                    y_i = int(y); m_i = int(m)
-                except Exception:
+            for m in range(1, 13):
+                days = self._by_ym.get((year, m))
+                if not days:
                     continue
-                if y_i != year:
-                    continue
-                rec = data.setdefault(m_i, {"questions": 0, "seconds": 0})
-                rec["questions"] += int((v or {}).get("questions", 0) or 0)
-                rec["seconds"] += int((v or {}).get("seconds", 0) or 0)
+                data[m] = {"questions": sum(r["questions"] for r in days.values()),
+                           "seconds": sum(r["seconds"] for r in days.values())}
         else:
             import calendar
             _, ndays = calendar.monthrange(year, month)
+            days = self._by_ym.get((year, month), {})
+            empty = {"questions": 0, "seconds": 0}
             for day in range(1, ndays + 1):
-                key = f"{year:04d}-{month:02d}-{day:02d}"
-                rec = self.activity.get(key) or {}
-                data[day] = {"questions": int(rec.get("questions", 0) or 0), "seconds": int(rec.get("seconds", 0) or 0)}
+                data[day] = days.get(day, empty)
         return data
 
     def _max_value_in_map(self, m):
         if not m:
             return 0
-        return max((v.get("questions", 0) for v in m.values()), default=0)
-
-    def _mix_gray_to_green(self, t):
-        from PySide6.QtGui import QColor
-        t = max(0.0, min(1.0, float(t)))
-        g_r = int(200 + (0 - 200) * t)
-        g_g = int(200 + (180 - 200) * t)
-        g_b = int(200 + (0 - 200) * t)
-        return QColor(g_r, g_g, g_b)
+        return max((v["questions"] for v in m.values()), default=0)
 
     def _draw_heatmap(self, canvas_widget, painter):
         w = canvas_widget.width()
         h = canvas_widget.height()
-        painter.fillRect(0, 0, w, h, canvas_widget.palette().window())
+        painter.fillRect(0, 0, w, h, self._pal_window)
 
         year_text = self.year_combo.currentText()
         try:
@@ -222,6 +574,10 @@ class HeatmapDialog(QWidget):
 
         data_map = self._gather_month_map(year, month)
         maxv = max(1, self._max_value_in_map(data_map))
+        cells = self._cells
+        cells.clear()
+        gradient = _HEAT_GRADIENT
+        border_rects = []
 
         painter.setPen(Qt.black)
 
@@ -238,14 +594,14 @@ class HeatmapDialog(QWidget):
                 x = pad + c * (box_w + 8)
                 y = pad + r * (box_h + 8) + 30
                 rec = data_map.get(mnum, {"questions": 0, "seconds": 0})
-                val = int(rec.get("questions", 0) or 0)
-                t = val / float(maxv)
-                color = self._mix_gray_to_green(t)
-                painter.fillRect(x, y, box_w, box_h, color)
-                painter.drawRect(x, y, box_w, box_h)
-                painter.drawText(x + 6, y + 18, time.strftime("%b", time.strptime(f"{mnum}", "%m")))
-                setattr(self, f"_cell_{i}", QRect(x, y, box_w, box_h))
-                setattr(self, f"_cell_val_{i}", (mnum, rec))
+                val = rec["questions"]
+                color = gradient[val * 255 // maxv]
+                cell_rect = QRect(x, y, box_w, box_h)
+                painter.fillRect(cell_rect, color)
+                painter.drawText(x + 6, y + 18, self._month_abbr[mnum])
+                border_rects.append(cell_rect)
+                cells.append((cell_rect, mnum, rec))
+            painter.drawRects(border_rects)
         else:
             import calendar
             cal = calendar.Calendar(firstweekday=0)
@@ -266,15 +622,6 @@ class HeatmapDialog(QWidget):
             header_h = 22
             header_y = top - header_h - 6
 
-            base_bg = canvas_widget.palette().window().color()
-            header_grey = canvas_widget.palette().mid().color()
-            header_grey_brush = header_grey
-
-            today_highlight = QColor(180, 210, 255)
-
-            border_color = canvas_widget.palette().shadow().color()
-            painter.setPen(border_color)
-
             weekday_names = ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"]
             for c in range(7):
                 txt = weekday_names[c]
@@ -282,13 +629,12 @@ class HeatmapDialog(QWidget):
                 header_rect = QRect(hx, header_y, box_w, header_h)
 
                 if is_current_month and c == today.weekday():
-                    painter.fillRect(header_rect, today_highlight)
+                    painter.fillRect(header_rect, _TODAY_HI)
                 else:
-                    painter.fillRect(header_rect, header_grey_brush)
+                    painter.fillRect(header_rect, self._pal_mid)
 
-                painter.drawRect(header_rect)
-                painter.setPen(Qt.black)
                 painter.drawText(header_rect, Qt.AlignCenter, txt)
+                border_rects.append(header_rect)
             for idx, d in enumerate(month_days):
                 pos = idx + first_weekday
                 r = pos // cols
@@ -296,17 +642,14 @@ class HeatmapDialog(QWidget):
                 x = pad + c * (box_w + 6)
                 y = top + r * (box_h + 6)
                 rec = data_map.get(d.day, {"questions": 0, "seconds": 0})
-                val = int(rec.get("questions", 0) or 0)
-                t = val / float(maxv)
-                color = self._mix_gray_to_green(t)
+                val = rec["questions"]
+                color = gradient[val * 255 // maxv]
                 cell_rect = QRect(x, y, box_w, box_h)
                 painter.fillRect(cell_rect, color)
-                painter.drawRect(cell_rect)
-
-                painter.setPen(Qt.black)
                 painter.drawText(cell_rect, Qt.AlignCenter, str(d.day))
-                setattr(self, f"_cell_{idx}", QRect(x, y, box_w, box_h))
-                setattr(self, f"_cell_val_{idx}", (d, rec))
+                border_rects.append(cell_rect)
+                cells.append((cell_rect, d, rec))
+            painter.drawRects(border_rects)
 
         self.legend_label.setText(f"Max: {maxv} questions — gray→green scale")
 
@@ -322,64 +665,67 @@ class HeatmapDialog(QWidget):
             except Exception:
                 return "0m"
 
-        for attr in dir(self):
-            if not attr.startswith("_cell_") or attr.startswith("_cell_val_"):
+        for rect, key, rec in self._cells:
+            if not rect.contains(pos):
                 continue
-            rect = getattr(self, attr)
-            if isinstance(rect, QRect) and rect.contains(pos):
-                idx = attr.split("_")[-1]
-                valattr = f"_cell_val_{idx}"
-                if hasattr(self, valattr):
-                    v = getattr(self, valattr)
-                    if isinstance(v, tuple):
-                        key, rec = v
-                        rec = rec or {}
-                        q = int(rec.get("questions", 0) or 0)
-                        secs = int(rec.get("seconds", 0) or 0)
-                        timestr = fmt_time(secs)
-                        if isinstance(key, int):
-                            try:
-                                month_name = time.strftime('%B', time.strptime(str(key), '%m'))
-                            except Exception:
-                                month_name = str(key)
-                            text = f"{month_name} {self.year_combo.currentText()}: {q} questions — {timestr}"
-                        else:
-                            text = f"{key.isoformat()}: {q} questions — {timestr}"
-                        self._hover_label.setText(text)
-                        self._hover_label.adjustSize()
-                        x = pos.x() + 12
-                        y = pos.y() + 12
-                        max_x = canvas_widget.width() - self._hover_label.width() - 6
-                        max_y = canvas_widget.height() - self._hover_label.height() - 6
-                        x = min(max(6, x), max_x)
-                        y = min(max(6, y), max_y)
-                        self._hover_label.move(x, y)
-                        self._hover_label.show()
-                        return
-        self._hover_label.hide()
+            q = rec["questions"]
+            timestr = fmt_time(rec["seconds"])
+            if isinstance(key, int):
+                month_name = self._month_name[key]
+                text = f"{month_name} {self.year_combo.currentText()}: {q} questions — {timestr}"
+            else:
+                text = f"{key.isoformat()}: {q} questions — {timestr}"
+            size = canvas_widget.fontMetrics().size(0, text) + QSize(8, 8)
+            x = pos.x() + 12
+            y = pos.y() + 12
+            max_x = canvas_widget.width() - size.width() - 6
+            max_y = canvas_widget.height() - size.height() - 6
+            x = min(max(6, x), max_x)
+            y = min(max(6, y), max_y)
+            tip = QRect(QPoint(x, y), size)
+            if text != self._hover_text or tip != self._hover_rect:
+                canvas_widget.update(self._hover_rect.united(tip))
+                self._hover_text = text
+                self._hover_rect = tip
+            return
+        self._hide_hover()
 
     def _hide_hover(self):
-        if hasattr(self, "_hover_label"):
-            self._hover_label.hide()
+        if self._hover_text is not None:
+            self.canvas.update(self._hover_rect)
+            self._hover_text = None
+            self._hover_rect = QRect()
     
 
 class MainWindow(QMainWindow):
+    _pfp_cache: dict = {}
+    _save_requested = Signal(str, object)
+    _append_requested = Signal(str, object)
+
+    _LOG_LIMIT = 1 << 20
+    _DF_CACHE_SIZE = 16
+
     def __init__(self):
         super().__init__()
 
         appdata = user_data_dir("KanjiDriller")
         self.stats_path = os.path.join(appdata, "kanji_stats.json")
         self.profile_path = os.path.join(appdata, "profile.json")
+        self._log_paths = {self.stats_path: self.stats_path + ".log",
+                           self.profile_path: self.profile_path + ".log"}
+        self._stats_log_path = self._log_paths[self.stats_path]
+        self._profile_log_path = self._log_paths[self.profile_path]
         self.appdata = appdata
 
         self.drillFilters = {
             "system": "JLPT",
             "drill": "Meaning",
-            "jlpt_levels": [5],
-            "wanikani_levels": [],
+            "jlpt_levels": {5},
+            "wanikani_levels": set(),
             "count": 4,
             "max_count": 79,
-            "prioritize_weakness": True
+            "prioritize_weakness": True,
+            "jlpt_sublevels": {},
         }
 
         self.jlpt_sublevel_counts = {
@@ -387,33 +733,92 @@ class MainWindow(QMainWindow):
             2: 2,
             3: 2
         }
-        self.drillFilters.setdefault("jlpt_sublevels", {})
-        self.drillFilters.setdefault("jlpt_levels", [])
+        self._df_cache = OrderedDict()
+        self._level_idx_cache = {}
+        self._pfp_exists_cache = {}
         self.kanji_stats = {}
         self.profile_data = {}
+        self._saved_hashes = {}
+        self._pending_saves = {}
+        self._dirty_kanji = set()
+        self._dirty_profile_keys = set()
+        self._log_bytes = dict.fromkeys(self._log_paths, 0)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(1000)
+        self._save_timer.timeout.connect(self._flush_saves)
+        self._io_thread = QThread(self)
+        self._saver = _Saver()
+        self._saver.moveToThread(self._io_thread)
+        self._save_requested.connect(self._saver.write)
+        self._append_requested.connect(self._saver.append)
+        self._saver.failed.connect(self._on_save_failed)
+        self._saver.logs.update(self._log_paths)
+        self._io_thread.start()
+        QApplication.instance().aboutToQuit.connect(self._shutdown_io)
         self._results_page = None
         self._profile_page = None
+        self._q_error_label = None
+        self._q_container = None
+        self._results_page_index = None
+        self._profile_page_index = None
+        self._profile_dirty = False
 
         self.load_or_create_stats()
         self.load_or_create_profile()
 
-        self.profile_data.setdefault("activity", {})
-        self.save_profile()
-
         self.df_f = self.build_filtered_df()
-        self.currentSample = getRandomSample(self.df_f, self.drillFilters["count"])
-
-        self.currentRow = None
+        self.currentSample = None
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self._apply_filters)
+        self._count_timer = QTimer(self)
+        self._count_timer.setSingleShot(True)
+        self._count_timer.setInterval(200)
+        self._count_timer.timeout.connect(self._refresh_count_label)
+
+        self.currentRow = {}
         self.currentQuestionBatch = None
         self.currentAnswer = None
+        self.correct_answer_text = ""
+        self.answer_buttons = []
+        self.meaning_mode = "multiple_choice"
+        self.reading_type = "kunyomi"
+        self._current_meanings_list = []
+        self._current_meanings_set = frozenset()
+        self._pw_current_session_id = 0
+        self._drill_status_label = None
+        self._train_overlay = None
 
         self.currentQuestionIndex = 0
         self.totalQuestions = 0
+        self._perm_table = None
+        self._coin_flips = None
+        self._q_label_is_kanji = None
+        self._fmt_sample = None
+        self._fmt_cols = {}
+        self._fmt_fn = {}
 
         self.popup_seconds = 1.5
+
+        self._btn_font = QFont()
+        self._btn_font.setPointSize(14)
+        self._btn_kanji_font = QFont()
+        self._btn_kanji_font.setPointSize(44)
+        self._kanji_font = QFont()
+        self._kanji_font.setPointSize(56)
+        self._text_font = QFont()
+        self._text_font.setPointSize(22)
+        self._overlay_font = QFont()
+        self._overlay_font.setPointSize(26)
         self._session_start_avg_prof = None
 
         self.session_results = []
+        self._session_idx = 0
+        self._session_correct = 0
+        self._session_wrongs = []
         self.session_xp = {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}}
 
         self.setWindowTitle("Kanji Driller")
@@ -422,11 +827,52 @@ class MainWindow(QMainWindow):
         self._button_min_width = max(300, self.width() - 40)
 
         class SlideStack(QStackedWidget):
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                self._pending_next = None
+                self._cur_label = QLabel(self)
+                self._next_label = QLabel(self)
+                self._group = QParallelAnimationGroup(self)
+                self._anim_cur = self._make_anim(self._cur_label)
+                self._anim_next = self._make_anim(self._next_label)
+                self._group.finished.connect(self._finish_slide)
+                self._cur_label.hide()
+                self._next_label.hide()
+
+            def _make_anim(self, label):
+                anim = QPropertyAnimation(label, b"pos", self._group)
+                anim.setDuration(300)
+                anim.setEasingCurve(QEasingCurve.OutCubic)
+                self._group.addAnimation(anim)
+                return anim
+
+            def _snapshot(self, label, page, pos):
+                label.setPixmap(page.grab())
+                label.setGeometry(QRect(pos, page.size()))
+                label.show()
+                label.raise_()
+
+            def _finish_slide(self):
+                next_w, self._pending_next = self._pending_next, None
+                if next_w is not None:
+                    self.setCurrentWidget(next_w)
+                for label in (self._cur_label, self._next_label):
+                    label.hide()
+                    label.clear()
+
             def slide_to(self, index, direction="left"):
+                if self._group.state() == QParallelAnimationGroup.Running:
+                    if self.widget(index) is self._pending_next:
+                        return
+                    self._group.stop()
+                    self._finish_slide()
                 if index == self.currentIndex():
                     return
                 current = self.currentWidget()
                 next_w = self.widget(index)
+                if not self.isVisible():
+                    self.setCurrentWidget(next_w)
+                    return
                 w = self.width()
                 h = self.height()
                 if direction == "left":
@@ -436,29 +882,15 @@ class MainWindow(QMainWindow):
                     next_start = QPoint(-w, 0)
                     current_end = QPoint(w, 0)
                 next_w.setGeometry(0, 0, w, h)
-                next_w.move(next_start)
-                next_w.show()
-                anim_cur = QPropertyAnimation(current, b"pos")
-                anim_cur.setEndValue(current_end)
-                anim_cur.setDuration(300)
-                anim_cur.setEasingCurve(QEasingCurve.OutCubic)
-                anim_next = QPropertyAnimation(next_w, b"pos")
-                anim_next.setStartValue(next_start)
-                anim_next.setEndValue(QPoint(0, 0))
-                anim_next.setDuration(300)
-                anim_next.setEasingCurve(QEasingCurve.OutCubic)
-                group = QParallelAnimationGroup(self)
-                group.addAnimation(anim_cur)
-                group.addAnimation(anim_next)
-
-                def finish():
-                    self.setCurrentWidget(next_w)
-                    current.move(0, 0)
-                    next_w.move(0, 0)
-                    group.deleteLater()
-
-                group.finished.connect(finish)
-                group.start()
+                # slide static snapshots so neither page is re-laid out per frame
+                self._snapshot(self._cur_label, current, QPoint(0, 0))
+                self._snapshot(self._next_label, next_w, next_start)
+                self._anim_cur.setStartValue(QPoint(0, 0))
+                self._anim_cur.setEndValue(current_end)
+                self._anim_next.setStartValue(next_start)
+                self._anim_next.setEndValue(QPoint(0, 0))
+                self._pending_next = next_w
+                self._group.start()
 
         self.stack = SlideStack()
 
@@ -483,14 +915,7 @@ class MainWindow(QMainWindow):
         self.mainMenuUsername.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.mainMenuPFP = ClickableLabel()
-        main_pix_path = self.profile_data.get("pfp_path", resource_path("pfp.png"))
-        try:
-            mainPix = QPixmap(main_pix_path)
-            if mainPix.isNull():
-                mainPix = QPixmap(resource_path("pfp.jpg"))
-        except Exception:
-            mainPix = QPixmap(resource_path("pfp.jpg"))
-        mainPix = mainPix.scaledToHeight(215, Qt.SmoothTransformation)
+        mainPix = self._load_pfp()
         self.mainMenuPFP.setPixmap(mainPix)
         self.mainMenuPFP.setFixedSize(mainPix.width(), mainPix.height())
         self.mainMenuPFP.set_on_click(lambda: (self.build_profile_page(), self.stack.slide_to(self.profile_index(), "left")))
@@ -635,6 +1060,8 @@ class MainWindow(QMainWindow):
 
         self._jlpt_base_checkboxes = {}
         self._jlpt_sub_checkboxes = {}
+        self._jlpt_group = QButtonGroup(self)
+        self._jlpt_group.setExclusive(False)
 
         levels_order = []
         levels_order.append((5, None))
@@ -652,9 +1079,9 @@ class MainWindow(QMainWindow):
             c = idx % cols
             text = f"N{base}" if sub is None else f"N{base}.{sub}"
             cb = QCheckBox(text)
-            cb.stateChanged.connect(self.level_filter)
+            self._jlpt_group.addButton(cb)
             if sub is None:
-                cb.setChecked(base in self.drillFilters.get("jlpt_levels", []))
+                cb.setChecked(base in self.drillFilters.get("jlpt_levels", set()))
                 self._jlpt_base_checkboxes[base] = cb
             else:
                 existing = self.drillFilters.get("jlpt_sublevels", {}).get(base)
@@ -662,6 +1089,7 @@ class MainWindow(QMainWindow):
                     cb.setChecked(True)
                 self._jlpt_sub_checkboxes[(base, sub)] = cb
             jlpt_grid.addWidget(cb, r, c)
+        self._jlpt_group.buttonToggled.connect(self.level_filter)
 
         jlpt_v.addWidget(jlpt_grid_widget)
         DrillMenuLayout.addWidget(self.DrillMenuJLPTSection)
@@ -685,21 +1113,18 @@ class MainWindow(QMainWindow):
         wk_grid.setVerticalSpacing(12)
         wk_grid.setContentsMargins(0, 0, 0, 0)
 
-        columns = 10
-        start_col = 1
-        for i in range(1, 61):
-            checkbox = QCheckBox(str(i))
-            checkbox.stateChanged.connect(self.level_filter)
-            index = i - 1
-            row = index // columns
-            col = index % columns
-            wk_grid.addWidget(checkbox, row, col)
+        self._wk_grid = wk_grid
+        self._wk_grid_built = False
+        self._wk_boxes = [None] * 61
+        self._wk_group = QButtonGroup(self)
+        self._wk_group.setExclusive(False)
 
         wk_v.addWidget(wk_grid_widget)
         DrillMenuLayout.addWidget(self.DrillMenuWaniKaniSection)
         self.DrillMenuWaniKaniSection.hide()
 
         if self.drillFilters.get("system", "JLPT") == "WaniKani":
+            self._ensure_wanikani_grid_built()
             self.DrillMenuJLPTSection.hide()
             self.DrillMenuWaniKaniSection.show()
         else:
@@ -740,102 +1165,294 @@ class MainWindow(QMainWindow):
         self.update_count_label()
 
     def load_or_create_stats(self):
+        self._total_encounters = None
+        _finish_atomic_write(self.stats_path, self._stats_log_path)
         if os.path.exists(self.stats_path):
             try:
-                with open(self.stats_path, "r", encoding="utf-8") as f:
-                    self.kanji_stats = json.load(f)
+                self.kanji_stats = _load_json_file(self.stats_path)
             except Exception:
                 self.kanji_stats = {}
         else:
             self.kanji_stats = {}
             self.save_stats()
+        self._replay_stats_log()
 
         try:
             for k in list(self.kanji_stats.keys()):
                 self.ensure_kanji_entry(k)
+                _normalize_counters(self.kanji_stats[k])
             self.save_stats()
         except Exception:
             pass
 
+    def _read_log(self, log_path):
+        # entries appended since the last full write of the matching file
+        try:
+            with open(log_path, "rb") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        loads = orjson.loads if orjson is not None else json.loads
+        for line in lines:
+            try:
+                yield loads(line)
+            except Exception:
+                continue
+
+    def _replay_stats_log(self):
+        # each line holds a whole kanji entry
+        for rec in self._read_log(self._stats_log_path):
+            try:
+                self.kanji_stats[rec["k"]] = rec["v"]
+            except Exception:
+                continue
+
+    def _replay_profile_log(self):
+        # each line holds the value at one key path, e.g. ["activity", "2024-05-01"]
+        for rec in self._read_log(self._profile_log_path):
+            try:
+                *parents, last = rec["p"]
+                target = self.profile_data
+                for key in parents:
+                    target = target.setdefault(key, {})
+                target[last] = rec["v"]
+            except Exception:
+                continue
+
+    def _arm_save_timer(self):
+        # throttle rather than debounce so a steady stream of answers still flushes
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _save_json(self, path, obj):
+        self._pending_saves[path] = obj
+        self._arm_save_timer()
+
+    def _schedule_save(self, kanji_key=None, profile_keys=None):
+        if kanji_key is None:
+            self._pending_saves[self.stats_path] = self.kanji_stats
+        else:
+            self._dirty_kanji.add(kanji_key)
+        if profile_keys is None:
+            self._pending_saves[self.profile_path] = self.profile_data
+        else:
+            self._dirty_profile_keys.update(profile_keys)
+        self._arm_save_timer()
+
+    def _profile_value(self, keys):
+        value = self.profile_data
+        for key in keys:
+            value = value[key]
+        return value
+
+    def _append_log(self, path, data):
+        self._log_bytes[path] += len(data)
+        if self._log_bytes[path] > self._LOG_LIMIT:
+            return False
+        self._append_requested.emit(self._log_paths[path], data)
+        return True
+
+    def _flush_stats_log(self):
+        dirty, self._dirty_kanji = self._dirty_kanji, set()
+        try:
+            data = b"".join(_dump_json_line({"k": k, "v": self.kanji_stats[k]}) for k in dirty)
+        except Exception:
+            data = None
+        if data is None or not self._append_log(self.stats_path, data):
+            self._pending_saves[self.stats_path] = self.kanji_stats
+
+    def _flush_profile_log(self):
+        dirty, self._dirty_profile_keys = self._dirty_profile_keys, set()
+        try:
+            data = b"".join(_dump_json_line({"p": list(keys), "v": self._profile_value(keys)}) for keys in dirty)
+        except Exception:
+            data = None
+        if data is None or not self._append_log(self.profile_path, data):
+            self._pending_saves[self.profile_path] = self.profile_data
+
+    def _flush_saves(self):
+        if self._dirty_kanji and self.stats_path not in self._pending_saves:
+            self._flush_stats_log()
+        if self._dirty_profile_keys and self.profile_path not in self._pending_saves:
+            self._flush_profile_log()
+        pending, self._pending_saves = self._pending_saves, {}
+        if self.stats_path in pending:
+            self._dirty_kanji.clear()
+        if self.profile_path in pending:
+            self._dirty_profile_keys.clear()
+        for path, obj in pending.items():
+            try:
+                data = _dump_json_bytes(obj)
+            except Exception:
+                continue
+            # a pending log still has to be folded in, even if the content matches
+            logged = self._log_bytes.get(path, 0)
+            self._log_bytes[path] = 0
+            digest = hash(data)
+            if self._saved_hashes.get(path) == digest and not logged:
+                continue
+            self._saved_hashes[path] = digest
+            self._save_requested.emit(path, data)
+
+    def _on_save_failed(self, path):
+        # a lost log append is recovered by rewriting the file it belongs to
+        for base, log_path in self._log_paths.items():
+            if path == log_path:
+                path = base
+        # forget the hash so the retry is not skipped as already saved
+        self._saved_hashes.pop(path, None)
+        if path not in self._pending_saves:
+            self._pending_saves[path] = self.kanji_stats if path == self.stats_path else self.profile_data
+        self._arm_save_timer()
+
+    def _shutdown_io(self):
+        self._save_timer.stop()
+        if not self._io_thread.isRunning():
+            return
+        self._io_thread.quit()
+        self._io_thread.wait()
+        # queued writes may have been dropped with the thread; write whatever did not land
+        for path, obj in ((self.stats_path, self.kanji_stats), (self.profile_path, self.profile_data)):
+            try:
+                data = _dump_json_bytes(obj)
+                if self._saver.written.get(path) != hash(data):
+                    _write_atomic(path, data, self._log_paths[path])
+                else:
+                    self._saver.discard(self._log_paths[path])
+            except Exception:
+                continue
+
+    def closeEvent(self, event):
+        self._shutdown_io()
+        super().closeEvent(event)
+
     def save_stats(self):
         try:
-            with open(self.stats_path, "w", encoding="utf-8") as f:
-                json.dump(self.kanji_stats, f, ensure_ascii=False, indent=2)
+            self._save_json(self.stats_path, self.kanji_stats)
         except Exception:
             pass
 
     def load_or_create_profile(self):
-        default_profile = {
-            "username": "User",
-            "pfp_path": os.path.join(self.appdata, "pfp.png"),
-            "xp": {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}}
-        }
-
-        self.profile_data.setdefault("activity", {})
+        default_profile = {**_PROFILE_DEFAULTS, "pfp_path": os.path.join(self.appdata, "pfp.png")}
+        _finish_atomic_write(self.profile_path, self._profile_log_path)
 
         if os.path.exists(self.profile_path):
             try:
-                with open(self.profile_path, "r", encoding="utf-8") as f:
-                    self.profile_data = json.load(f)
+                self.profile_data = _load_json_file(self.profile_path)
             except Exception:
                 self.profile_data = default_profile.copy()
+            self._replay_profile_log()
         else:
-            bundled_pfp = None
-            for ext in ("jpg", "png", "jpeg", "webp"):
-                candidate = resource_path(f"pfp.{ext}")
-                if os.path.exists(candidate):
-                    bundled_pfp = candidate
-                    break
+            self.profile_data = default_profile.copy()
+            bundled_pfp = _resolve_bundled_pfp()
 
             if bundled_pfp:
                 target_pfp = os.path.join(self.appdata, os.path.basename(bundled_pfp))
                 try:
-                    if not os.path.exists(target_pfp):
+                    if not self._cached_exists(target_pfp):
                         shutil.copyfile(bundled_pfp, target_pfp)
+                        self._pfp_exists_cache[target_pfp] = True
                     self.profile_data["pfp_path"] = target_pfp
                 except Exception:
                     self.profile_data["pfp_path"] = bundled_pfp
             else:
                 self.profile_data["pfp_path"] = resource_path("pfp.jpg")
-
-            try:
-                if not os.path.exists(target_pfp):
-                    shutil.copyfile(bundled_pfp, target_pfp)
-            except Exception:
-                pass
-            self.profile_data = default_profile.copy()
             self.save_profile()
 
-        self.profile_data.setdefault("username", "User")
+        self.profile_data = {**_PROFILE_DEFAULTS, **self.profile_data}
+        xp = self.profile_data["xp"]
+        self.profile_data["xp"] = xp | {sysn: drills | (xp.get(sysn) or {}) for sysn, drills in _PROFILE_DEFAULTS["xp"].items()}
         pfp_path = self.profile_data.get("pfp_path")
         if not pfp_path:
             pfp_path = os.path.join(self.appdata, "pfp.jpg")
             self.profile_data["pfp_path"] = pfp_path
 
-        if not os.path.exists(pfp_path):
-            bundled = resource_path("pfp.jpg")
+        if not self._cached_exists(pfp_path):
+            bundled = _resolve_bundled_pfp() or resource_path("pfp.jpg")
+            target_pfp = os.path.join(self.appdata, os.path.basename(bundled))
             try:
-                shutil.copyfile(bundled, os.path.join(self.appdata, "pfp.jpg"))
-                self.profile_data["pfp_path"] = os.path.join(self.appdata, "pfp.jpg")
+                shutil.copyfile(bundled, target_pfp)
+                self._pfp_exists_cache[target_pfp] = True
+                self.profile_data["pfp_path"] = target_pfp
             except Exception:
                 self.profile_data["pfp_path"] = bundled
 
-        self.profile_data.setdefault("xp", {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}})
-        for sysn in ("JLPT", "WaniKani"):
-            self.profile_data["xp"].setdefault(sysn, {})
-            for dr in ("Meaning", "Reading"):
-                self.profile_data["xp"][sysn].setdefault(dr, 0)
-        self.profile_data.setdefault("pw_question_counter", 0)
-        self.profile_data.setdefault("pw_session_counter", 0)
+        self.profile_data["activity"] = _normalize_activity(self.profile_data.get("activity"))
         self.save_profile()
 
     def save_profile(self):
         try:
-            with open(self.profile_path, "w", encoding="utf-8") as f:
-                json.dump(self.profile_data, f, ensure_ascii=False, indent=2)
+            self._save_json(self.profile_path, self.profile_data)
         except Exception:
             pass
 
+    def _cached_exists(self, path):
+        # profile pictures only appear through this window, so one stat per path is enough
+        exists = self._pfp_exists_cache.get(path)
+        if exists is None:
+            exists = self._pfp_exists_cache[path] = os.path.isfile(path)
+        return exists
+
+    def _load_pfp(self, height=215):
+        candidates = (self.profile_data.get("pfp_path"), _resolve_bundled_pfp())
+        for path in candidates:
+            if path and self._cached_exists(path):
+                pix = self._get_scaled_pfp(path, height)
+                if not pix.isNull():
+                    return pix
+        return QPixmap()
+
+    def _get_scaled_pfp(self, path, height=215):
+        try:
+            mtime = os.path.getmtime(path)
+            key = (path, mtime, height)
+        except OSError:
+            key = None
+        if key is not None:
+            pix = self._pfp_cache.get(key)
+            if pix is not None:
+                return pix
+            pix = QPixmap()
+            if QPixmapCache.find(f"pfp:{path}:{mtime}:{height}", pix):
+                self._pfp_cache[key] = pix
+                return pix
+
+        scaled_path = None
+        if key is not None:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            scaled_path = os.path.join(self.appdata, f"{stem}_{height}.png")
+
+        pix = QPixmap()
+        try:
+            # the on-disk copy is stamped with the source's mtime when written
+            if scaled_path and os.path.getmtime(scaled_path) == mtime:
+                pix = QPixmap(scaled_path)
+        except OSError:
+            pass
+
+        if pix.isNull():
+            pix = QPixmap(path)
+            if pix.isNull():
+                return pix
+            if pix.height() > height * 2:
+                pix = pix.scaledToHeight(height * 2, Qt.FastTransformation)
+            pix = pix.scaledToHeight(height, Qt.SmoothTransformation)
+            if scaled_path:
+                try:
+                    if pix.save(scaled_path, "PNG"):
+                        os.utime(scaled_path, (mtime, mtime))
+                except OSError:
+                    pass
+
+        if key is not None:
+            # a replaced picture reuses the same path; drop its stale decodes
+            for old in [k for k in self._pfp_cache if k[0] == path and k[2] == height]:
+                del self._pfp_cache[old]
+                QPixmapCache.remove(f"pfp:{path}:{old[1]}:{height}")
+            self._pfp_cache[key] = pix
+            QPixmapCache.insert(f"pfp:{path}:{mtime}:{height}", pix)
+        return pix
+
     def xp_per_correct(self, system_name, drill_name):
         return 12 if drill_name == "Reading" else 10
 
@@ -844,32 +1461,24 @@ class MainWindow(QMainWindow):
         return base if is_correct else int(round(base * 0.15))
 
     def get_bucket_level_progress(self, xp_value):
-        xp_per_level = 500
-        level = int(xp_value // xp_per_level) + 1
-        within = int(xp_value % xp_per_level)
-        pct = int((within / xp_per_level) * 100)
-        return level, within, xp_per_level, pct
+        return _bucket_level_progress(int(xp_value))
 
     def total_questions_answered_overall(self):
-        total = 0
-        for k, v in self.kanji_stats.items():
-            try:
-                total += int(v.get("total_encounters", 0))
-            except Exception:
-                pass
-        return total
+        if self._total_encounters is None:
+            total = 0
+            for k, v in self.kanji_stats.items():
+                try:
+                    total += int(v.get("total_encounters", 0))
+                except Exception:
+                    pass
+            self._total_encounters = total
+        return self._total_encounters
 
     def profile_index(self):
-        for i in range(self.stack.count()):
-            if self.stack.widget(i) is self._profile_page:
-                return i
-        return None
+        return self._profile_page_index
 
     def results_index(self):
-        for i in range(self.stack.count()):
-            if self.stack.widget(i) is self._results_page:
-                return i
-        return None
+        return self._results_page_index
 
     def update_count_label(self):
         if self.drillFilters["system"] == "JLPT":
@@ -913,6 +1522,7 @@ class MainWindow(QMainWindow):
 
         try:
             if self.drillFilters["system"] == "WaniKani":
+                self._ensure_wanikani_grid_built()
                 self.DrillMenuJLPTSection.hide()
                 self.DrillMenuWaniKaniSection.show()
             else:
@@ -931,14 +1541,31 @@ class MainWindow(QMainWindow):
         else:
             self.DrillMenuMeaningModeCombo.hide()
 
+        self._schedule_filters()
+
+    def _schedule_filters(self):
+        self._count_timer.stop()
+        self._filter_timer.start()
+
+    def _schedule_count_label(self):
+        if not self._filter_timer.isActive():
+            self._count_timer.start()
+
+    def _refresh_count_label(self):
+        try:
+            self.update_count_label()
+        except Exception:
+            pass
+
+    def _apply_filters(self):
         try:
             self.df_f = self.build_filtered_df()
         except Exception:
             try:
                 if self.drillFilters["system"] == "JLPT":
-                    self.df_f = filterDataFrame("JLPT", self.drillFilters.get("jlpt_levels", []), self.drillFilters.get("drill", "Meaning"))
+                    self.df_f = filterDataFrame("JLPT", self.drillFilters.get("jlpt_levels", set()), self.drillFilters.get("drill", "Meaning"))
                 else:
-                    self.df_f = filterDataFrame("WaniKani", self.drillFilters.get("wanikani_levels", []), self.drillFilters.get("drill", "Meaning"))
+                    self.df_f = filterDataFrame("WaniKani", self.drillFilters.get("wanikani_levels", set()), self.drillFilters.get("drill", "Meaning"))
             except Exception:
                 self.df_f = None
 
@@ -959,15 +1586,7 @@ class MainWindow(QMainWindow):
         else:
             self.DrillMenuMeaningModeCombo.hide()
 
-        if self.drillFilters["system"] == "JLPT":
-            self.df_f = self.build_filtered_df()
-        else:
-            self.df_f = self.build_filtered_df()
-        try:
-            self.drillFilters["max_count"] = getMaxCount(self.drillFilters["system"], self.drillFilters["jlpt_levels"], self.drillFilters["drill"])
-        except Exception:
-            pass
-        self.update_count_label()
+        self._schedule_filters()
 
     def prioritizeweakness_changed(self, state):
         self.drillFilters["prioritize_weakness"] = bool(state == Qt.CheckState.Checked)
@@ -975,27 +1594,17 @@ class MainWindow(QMainWindow):
     def readingtype_changed(self, text):
         val = "kunyomi" if text.lower().startswith("k") else "onyomi"
         self.reading_type = val
-        try:
-            self.update_count_label()
-        except Exception:
-            pass
+        self._schedule_count_label()
 
     def meaningmode_changed(self, text):
         self.meaning_mode = "writing" if text.lower().startswith("w") else "multiple_choice"
-        try:
-            self.update_count_label()
-        except Exception:
-            pass
+        self._schedule_count_label()
 
     def filtercount_changed(self, value):
         self.drillFilters["count"] = max(4, int(value))
 
-    def level_filter(self, state):
-        sender = self.sender()
-        if sender is None:
-            return
-        text = sender.text()
-        checked = sender.isChecked()
+    def level_filter(self, button, checked):
+        text = button.text()
         if self.drillFilters["system"] == "JLPT":
             if text.lower().startswith("n"):
                 parts = text.lstrip("Nn").split(".")
@@ -1003,23 +1612,21 @@ class MainWindow(QMainWindow):
                     base = int(parts[0])
                 except Exception:
                     return
-                jlpt_levels = self.drillFilters.setdefault("jlpt_levels", [])
+                jlpt_levels = self.drillFilters.setdefault("jlpt_levels", set())
                 if len(parts) == 1:
                     if checked:
-                        if base not in jlpt_levels:
-                            jlpt_levels.append(base)
+                        jlpt_levels.add(base)
                     else:
-                        if base in jlpt_levels:
-                            jlpt_levels.remove(base)
+                        jlpt_levels.discard(base)
                         self.drillFilters.setdefault("jlpt_sublevels", {}).pop(base, None)
                         for si in range(1, self.jlpt_sublevel_counts.get(base, 1) + 1):
                             cb = self._jlpt_sub_checkboxes.get((base, si))
                             if cb:
                                 try:
-                                    cb.blockSignals(True)
+                                    self._jlpt_group.blockSignals(True)
                                     cb.setChecked(False)
                                 finally:
-                                    cb.blockSignals(False)
+                                    self._jlpt_group.blockSignals(False)
                 else:
                     try:
                         subidx = int(parts[1])
@@ -1036,14 +1643,14 @@ class MainWindow(QMainWindow):
                         if subidx not in slist:
                             slist.append(subidx)
                         if base not in jlpt_levels:
-                            jlpt_levels.append(base)
+                            jlpt_levels.add(base)
                             base_cb = self._jlpt_base_checkboxes.get(base)
                             if base_cb:
                                 try:
-                                    base_cb.blockSignals(True)
+                                    self._jlpt_group.blockSignals(True)
                                     base_cb.setChecked(True)
                                 finally:
-                                    base_cb.blockSignals(False)
+                                    self._jlpt_group.blockSignals(False)
                     else:
                         if subidx in slist:
                             try:
@@ -1055,44 +1662,41 @@ class MainWindow(QMainWindow):
                             submap.pop(base, None)
                             try:
                                 if base in jlpt_levels:
-                                    jlpt_levels.remove(base)
+                                    jlpt_levels.discard(base)
                                     base_cb = self._jlpt_base_checkboxes.get(base)
                                     if base_cb:
                                         try:
-                                            base_cb.blockSignals(True)
+                                            self._jlpt_group.blockSignals(True)
                                             base_cb.setChecked(False)
                                         finally:
-                                            base_cb.blockSignals(False)
+                                            self._jlpt_group.blockSignals(False)
                             except Exception:
                                 pass
-                try:
-                    self.df_f = self.build_filtered_df()
-                except Exception:
-                    try:
-                        self.df_f = filterDataFrame(self.drillFilters["system"], self.drillFilters["jlpt_levels"], self.drillFilters["drill"])
-                    except Exception:
-                        self.df_f = None
-                self.update_count_label()
-                return
-        try:
-            val = int(text)
-        except Exception:
+                self._schedule_filters()
+
+    def _ensure_wanikani_grid_built(self):
+        if self._wk_grid_built:
             return
-        lst = self.drillFilters.setdefault("wanikani_levels", [])
+        self._wk_grid_built = True
+
+        columns = 10
+        selected = self.drillFilters.get("wanikani_levels", set())
+        for i in range(1, 61):
+            checkbox = QCheckBox(str(i))
+            checkbox.setChecked(i in selected)
+            self._wk_group.addButton(checkbox, i)
+            self._wk_boxes[i] = checkbox
+            index = i - 1
+            self._wk_grid.addWidget(checkbox, index // columns, index % columns)
+        self._wk_group.idToggled.connect(self._wk_toggle)
+
+    def _wk_toggle(self, level, checked):
+        levels = self.drillFilters.setdefault("wanikani_levels", set())
         if checked:
-            if val not in lst:
-                lst.append(val)
+            levels.add(level)
         else:
-            if val in lst:
-                lst.remove(val)
-        try:
-            self.df_f = self.build_filtered_df()
-        except Exception:
-            try:
-                self.df_f = filterDataFrame(self.drillFilters["system"], self.drillFilters["wanikani_levels"], self.drillFilters["drill"])
-            except Exception:
-                self.df_f = None
-        self.update_count_label()
+            levels.discard(level)
+        self._schedule_filters()
 
     def _start_session_timer(self):
         try:
@@ -1102,67 +1706,80 @@ class MainWindow(QMainWindow):
             self._session_timer_start = None
             self._session_accum_seconds = 0.0
 
-    def _slice_df_into_subgroups(self, df_level, group_count, subindex):
-        import pandas as pd
-        if df_level is None or getattr(df_level, "shape", (0, 0))[0] == 0:
-            return df_level.iloc[0:0].copy()
-        n = int(df_level.shape[0])
-        base = n // group_count
-        rem = n % group_count
-        idx = subindex - 1
-        start = idx * base + min(idx, rem)
-        size = base + (1 if idx < rem else 0)
-        return df_level.iloc[start:start + size].copy()
+    def _slice_into_subgroups(self, level_idx, group_count, subindices):
+        bounds = _subgroup_bounds(len(level_idx), group_count)
+        return [level_idx[slice(*bounds[i - 1])] for i in subindices if 1 <= i <= group_count]
+
+    def _filter_key(self):
+        system = self.drillFilters.get("system", "JLPT")
+        drill = self.drillFilters.get("drill", "Meaning")
+        if system != "JLPT":
+            return (system, tuple(sorted(self.drillFilters.get("wanikani_levels", set()))), drill)
+        subs = self.drillFilters.get("jlpt_sublevels", {}) or {}
+        return (
+            system,
+            tuple(sorted(self.drillFilters.get("jlpt_levels", set()))),
+            drill,
+            tuple(sorted((b, tuple(sorted(v or ()))) for b, v in subs.items())),
+        )
 
     def build_filtered_df(self):
+        try:
+            key = self._filter_key()
+            cached = self._df_cache.get(key)
+        except Exception:
+            return self._build_filtered_df_uncached()
+        if cached is None:
+            cached = self._build_filtered_df_uncached()
+            self._df_cache[key] = cached
+            if len(self._df_cache) > self._DF_CACHE_SIZE:
+                self._df_cache.popitem(last=False)
+        else:
+            self._df_cache.move_to_end(key)
+        return cached
+
+    def _build_filtered_df_uncached(self):
         import pandas as pd
         system = self.drillFilters.get("system", "JLPT")
         drill = self.drillFilters.get("drill", "Meaning")
         if system != "JLPT":
             try:
-                return filterDataFrame(system, self.drillFilters.get("wanikani_levels", []), drill)
+                return filterDataFrame(system, self.drillFilters.get("wanikani_levels", set()), drill)
             except Exception:
                 try:
-                    return filterDataFrame(system, self.drillFilters.get("wanikani_levels", []), drill)
+                    return filterDataFrame(system, self.drillFilters.get("wanikani_levels", set()), drill)
                 except Exception:
                     return pd.DataFrame()
         result_parts = []
-        jlpt_levels = list(sorted(set(self.drillFilters.get("jlpt_levels", [])), reverse=False))
+        jlpt_levels = sorted(self.drillFilters.get("jlpt_levels", set()))
         if not jlpt_levels:
             return pd.DataFrame()
         for base in jlpt_levels:
-            try:
-                level_df = filterDataFrame("JLPT", [base], drill)
-            except Exception:
-                try:
-                    level_df = filterDataFrame("JLPT", [base], drill)
-                except Exception:
-                    level_df = None
-            if level_df is None or getattr(level_df, "shape", (0, 0))[0] == 0:
-                continue
-            group_count = self.jlpt_sublevel_counts.get(base, 1)
             selected_subs = self.drillFilters.get("jlpt_sublevels", {}).get(base, [])
             if selected_subs is None:
                 selected_subs = []
             try:
-                selected_subs = sorted(int(x) for x in list(selected_subs))
+                selected_subs = tuple(sorted(int(x) for x in list(selected_subs)))
             except Exception:
-                selected_subs = []
-            if group_count == 1:
-                result_parts.append(level_df.copy())
-            else:
-                if selected_subs:
-                    for subidx in selected_subs:
-                        if subidx < 1 or subidx > group_count:
-                            continue
-                        slice_df = self._slice_df_into_subgroups(level_df, group_count, subidx)
-                        result_parts.append(slice_df)
-                else:
-                    result_parts.append(level_df.copy())
+                selected_subs = ()
+            key = (base, drill, selected_subs)
+            parts = self._level_idx_cache.get(key)
+            if parts is None:
+                parts = self._jlpt_level_parts(base, drill, selected_subs)
+                self._level_idx_cache[key] = parts
+            result_parts.extend(parts)
         if not result_parts:
             return pd.DataFrame()
-        combined = pd.concat(result_parts, ignore_index=True)
-        return combined
+        return getRowsAt(np.concatenate(result_parts)).reset_index(drop=True)
+
+    def _jlpt_level_parts(self, base, drill, selected_subs):
+        level_idx = filterIndices("JLPT", [base], drill)
+        if len(level_idx) == 0:
+            return ()
+        group_count = self.jlpt_sublevel_counts.get(base, 1)
+        if group_count == 1 or not selected_subs:
+            return (level_idx,)
+        return tuple(self._slice_into_subgroups(level_idx, group_count, selected_subs))
 
     def _stop_session_timer_and_record(self):
         try:
@@ -1181,7 +1798,8 @@ class MainWindow(QMainWindow):
             entry["seconds"] = int(entry.get("seconds", 0)) + int(round(self._session_accum_seconds))
         except Exception:
             entry["seconds"] = int(round(self._session_accum_seconds))
-        self.save_profile()
+        self._dirty_profile_keys.add(("activity", today))
+        self._arm_save_timer()
         self._session_accum_seconds = 0.0
 
     def _record_one_question_now(self):
@@ -1192,82 +1810,64 @@ class MainWindow(QMainWindow):
             entry["questions"] = int(entry.get("questions", 0)) + 1
         except Exception:
             entry["questions"] = 1
-        self.save_profile()
+        self._dirty_profile_keys.add(("activity", today))
+        self._arm_save_timer()
 
     def clear_layout(self, widget_or_layout):
         layout = widget_or_layout.layout() if isinstance(widget_or_layout, QWidget) else widget_or_layout
         if layout is None:
             return
-        while layout.count():
-            item = layout.takeAt(0)
-            w = item.widget()
-            if w:
-                w.setParent(None)
-            else:
-                nested = item.layout()
-                if nested:
-                    self.clear_layout(nested)
+        host = layout.parentWidget()
+        updates = host is not None and host.updatesEnabled()
+        if updates:
+            host.setUpdatesEnabled(False)
+        pending = deque([layout])
+        while pending:
+            current = pending.popleft()
+            while current.count():
+                item = current.takeAt(0)
+                w = item.widget()
+                if w is not None and (w is self._q_container or w is self._q_error_label):
+                    w.hide()
+                    w.setParent(None)
+                elif w:
+                    w.hide()
+                    w.deleteLater()
+                else:
+                    nested = item.layout()
+                    if nested:
+                        pending.append(nested)
+            if current is not layout:
+                current.deleteLater()
+        if updates:
+            host.setUpdatesEnabled(True)
+
     def _contains_kanji(self, s: str) -> bool:
-        if not s:
-            return False
-        for ch in s:
-            code = ord(ch)
-            if (0x4E00 <= code <= 0x9FFF) or (0x3400 <= code <= 0x4DBF) or (0xF900 <= code <= 0xFAFF):
-                return True
-        return False
+        return bool(s) and _KANJI_RE.search(s) is not None
 
     def _answer_button_font_for_text(self, text: str) -> QFont:
-        f = QFont()
-        if self._contains_kanji(text):
-            f.setPointSize(44)
-        else:
-            f.setPointSize(14)
-        return f
+        return self._btn_kanji_font if self._contains_kanji(text) else self._btn_font
 
     def _pick_readings_text(self, row, is_jlpt, prefer):
-        if is_jlpt:
-            kun_field = "readings_kun"
-            on_field = "readings_on"
-        else:
-            kun_field = "wk_readings_kun"
-            on_field = "wk_readings_on"
-
-        first_field = kun_field if prefer == "kunyomi" else on_field
-        second_field = on_field if prefer == "kunyomi" else kun_field
-
-        def normalize_list(val):
-            if val is None:
-                return []
-            if isinstance(val, (list, tuple)):
-                items = [str(x).strip() for x in val if x is not None and str(x).strip()]
-                return items
-            s = str(val).strip()
-            return [s] if s else []
-
-        def join_items(items):
-            return ", ".join(items) if items else ""
-
-        first_items = normalize_list(row.get(first_field))
-        if first_items:
-            return join_items(first_items)
+        first_field, second_field = _reading_fields(is_jlpt, prefer)
+        return _readings_text(row.get(first_field), row.get(second_field))
 
-        second_items = normalize_list(row.get(second_field))
-        if second_items:
-            return join_items(second_items)
+    def _collect_reading_distractors(self, batch_df, is_jlpt, prefer, needed=3, exclude=None):
+        seen = set(exclude or [])
+        first_field, second_field = _reading_fields(is_jlpt, prefer)
+        cols = getColumns(batch_df)
+        if first_field not in cols and second_field not in cols:
+            return []
+        missing = itertools.repeat(None)
 
-        return ""
+        def candidates():
+            for first, second in zip(cols.get(first_field, missing), cols.get(second_field, missing)):
+                rd = _readings_text(first, second)
+                if rd and rd not in seen:
+                    seen.add(rd)
+                    yield rd
 
-    def _collect_reading_distractors(self, batch_df, is_jlpt, prefer, needed=3, exclude=None):
-        exclude = set(exclude or [])
-        candidates = []
-        for _, r in batch_df.iterrows():
-            rd = self._pick_readings_text(r, is_jlpt, prefer)
-            if rd and rd not in exclude:
-                candidates.append(rd)
-
-        candidates = list(dict.fromkeys(candidates))
-        random.shuffle(candidates)
-        return candidates[:needed]
+        return reservoirSample(candidates(), needed)
     
     def _normalize_meaning_list(self, val):
         if val is None:
@@ -1281,29 +1881,9 @@ class MainWindow(QMainWindow):
         parts = [p.strip() for p in s.replace(";", ",").split(",")]
         return [p for p in parts if p]
 
-    def _is_meaning_input_correct(self, user_text: str, meanings_list):
-        if user_text is None:
-            return False
-
-        targets = [m.strip().lower() for m in meanings_list if m and str(m).strip()]
-        targets = [t for t in targets if t]
-        if not targets:
-            return False
-
-        raw = str(user_text).strip().lower()
-        if not raw:
-            return False
-
-        user_parts = [p.strip() for p in raw.replace(";", ",").split(",")]
-        user_parts = [p for p in user_parts if p]
-
-        if len(user_parts) == 1:
-            return user_parts[0] in targets
-
-        target_set = set(targets)
+    def _is_meaning_input_correct(self, user_parts, targets):
         user_set = set(user_parts)
-
-        return bool(user_set) and user_set.issubset(target_set)
+        return bool(user_set) and user_set <= targets
     
     def submit_meaning_written(self):
         edit = getattr(self, "meaning_input", None)
@@ -1322,17 +1902,18 @@ class MainWindow(QMainWindow):
                 pass
 
         user_text = edit.text()
-        expected_display = getattr(self, "correct_answer_text", "")
+        expected_display = self.correct_answer_text
 
-        meanings_list = getattr(self, "_current_meanings_list", [])
-        is_correct = self._is_meaning_input_correct(user_text, meanings_list)
+        user_parts = _split_answer_parts(user_text)
+        targets = self._current_meanings_set
+        is_correct = self._is_meaning_input_correct(user_parts, targets)
 
         try:
             kanji_key = str(self.currentRow.get("kanji"))
         except Exception:
             kanji_key = ""
 
-        self.session_results.append({
+        self._record_result({
             "kanji": kanji_key,
             "given": user_text,
             "expected": expected_display,
@@ -1342,13 +1923,7 @@ class MainWindow(QMainWindow):
         self.update_stats_and_profile(kanji_key, bool(is_correct))
 
         if is_correct:
-            targets = [m.strip().lower() for m in meanings_list if m and str(m).strip()]
-
-            raw = str(user_text).strip().lower()
-            user_parts = [p.strip() for p in raw.replace(";", ",").split(",")]
-            user_parts = [p for p in user_parts if p]
-
-            missed = sorted(set(targets) - set(user_parts))
+            missed = sorted(targets.difference(user_parts))
 
             if missed:
                 missed_display = ", ".join(missed)
@@ -1366,15 +1941,27 @@ class MainWindow(QMainWindow):
         else:
             self.show_overlay(is_correct=False, answers=expected_display)
 
+    def _prepare_question_randomness(self, n):
+        n = max(int(n), 1)
+        self._perm_table = logic.rng.permuted(np.tile(np.arange(4), (n, 1)), axis=1)
+        self._coin_flips = logic.rng.integers(0, 2, size=n, dtype=np.uint8)
+
+    def _question_randomness(self, index):
+        if self._perm_table is None or index >= len(self._perm_table):
+            self._prepare_question_randomness(max(index + 1, self.totalQuestions))
+        return self._perm_table[index], bool(self._coin_flips[index])
+
     def NewDrillQuestion(self, type_hint=None, index=0, total_count=0):
         if self.currentSample is None or len(self.currentSample) == 0:
             raise RuntimeError("No sample available")
 
         self.currentRow = getRow(self.currentSample, index)
         try:
-            self.currentQuestionBatch = getRandomRows(self.currentSample, index, 3)
+            self._batch_positions = getRandomRows(np.arange(len(self.currentSample)), index, 3)
+            self.currentQuestionBatch = self.currentSample.iloc[self._batch_positions]
         except Exception:
             import pandas as pd
+            self._batch_positions = None
             self.currentQuestionBatch = pd.DataFrame()
 
             fallback_df = getattr(self, "df_f", None)
@@ -1395,7 +1982,7 @@ class MainWindow(QMainWindow):
                         try:
                             self.currentQuestionBatch = getRandomRows(other, 0, 3)
                         except Exception:
-                            self.currentQuestionBatch = other.sample(n=3, replace=False).copy()
+                            self.currentQuestionBatch = other.sample(n=3, replace=False, random_state=logic.rng).copy()
                     else:
                         self.currentQuestionBatch = other.head(min(3, len(other))).copy()
                 except Exception:
@@ -1403,13 +1990,11 @@ class MainWindow(QMainWindow):
             else:
                 self.currentQuestionBatch = pd.DataFrame()
         is_jlpt = (self.drillFilters["system"] == "JLPT")
+        perm, coin = self._question_randomness(index)
 
-        def fmt_value(v):
-            if v is None:
-                return ""
-            if isinstance(v, (list, tuple)):
-                return ", ".join(str(x) for x in v if x is not None)
-            return str(v)
+        fmt = self._field_formatter
+        fmt_value = self._fmt_value
+        row = self.currentRow
 
         drill_type = self.drillFilters["drill"]
         prompt_is_kanji = False
@@ -1417,103 +2002,52 @@ class MainWindow(QMainWindow):
         if drill_type == "Meaning":
             meaning_field = "meanings" if is_jlpt else "wk_meanings"
 
-            if getattr(self, "meaning_mode", "multiple_choice") == "writing":
-                question_text = fmt_value(self.currentRow.get("kanji"))
+            if self.meaning_mode == "writing":
+                question_text = fmt("kanji")(row.get("kanji"))
                 prompt_is_kanji = True
 
                 meanings_list = self._normalize_meaning_list(self.currentRow.get(meaning_field))
                 correct_answer = ", ".join(meanings_list)
                 self._current_meanings_list = meanings_list
+                self._current_meanings_set = frozenset(m.lower() for m in meanings_list)
 
                 self.current_question_prompt_is_kanji = prompt_is_kanji
                 self.correct_answer_text = correct_answer
 
-                container = QWidget()
-                vlayout = QVBoxLayout(container)
-                vlayout.setSpacing(8)
-
-                qlabel = QLabel(question_text)
-                qlabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                qlabel.setWordWrap(True)
-                base_font = qlabel.font()
-                base_font.setPointSize(56)
-                qlabel.setFont(base_font)
-                vlayout.addWidget(qlabel)
-
                 try:
                     kanji_key = str(self.currentRow.get("kanji") or "")
-                    if kanji_key:
-                        try:
-                            self.ensure_kanji_entry(kanji_key)
-                        except Exception:
-                            pass
                     entry = self.kanji_stats.get(kanji_key, {}) if kanji_key else {}
                     mode_key = self._current_mode_key()
                     mastery = float(entry.get(self.drillFilters["system"], {}).get(mode_key, {}).get("mastery", 0.0) or 0.0)
                 except Exception:
                     mastery = 0.0
 
-                proficiency_lbl = QLabel(f"Proficiency: {int(round(mastery))}%")
-                proficiency_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                vlayout.addWidget(proficiency_lbl)
+                return self._populate_question(question_text, True, mastery, None, index, total_count)
 
-                
-
-                
-
-                input_row = QHBoxLayout()
-                self.meaning_input = QLineEdit()
-                self.meaning_input.setPlaceholderText("Type a meaning…")
-                self.meaning_input.setClearButtonEnabled(True)
-
-                self.meaning_input.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-
-                QTimer.singleShot(50, lambda: (self.meaning_input.setFocus(), self.meaning_input.selectAll()))
-
-                self.meaning_enter_btn = QPushButton("Enter")
-                self.meaning_enter_btn.setFixedWidth(90)
-
-                input_row.addWidget(self.meaning_input)
-                input_row.addWidget(self.meaning_enter_btn)
-                vlayout.addLayout(input_row)
-
-                self.meaning_enter_btn.clicked.connect(self.submit_meaning_written)
-                self.meaning_input.returnPressed.connect(self.submit_meaning_written)
-
-                display_index = index + 1
-                status_label = QLabel(f"{display_index}/{total_count}")
-                status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self._drill_status_label = status_label
-                vlayout.addWidget(status_label)
-
-                return container
-
-            kanji_to_meaning = random.choice([True, False])
+            kanji_to_meaning = coin
 
             if kanji_to_meaning:
-                question_text = self._fmt_value(self.currentRow["kanji"])
+                question_text = fmt("kanji")(row["kanji"])
                 prompt_is_kanji = True
-                correct_answer = self._fmt_value(self.currentRow.get(meaning_field))
+                correct_answer = fmt(meaning_field)(row.get(meaning_field))
 
-                wrong_answers = self._collect_unique_field_distractors(meaning_field, correct_answer, self.currentQuestionBatch, needed=3)
+                wrong_answers = self._collect_unique_field_distractors(meaning_field, correct_answer, self.currentQuestionBatch, needed=3, batch_pos=self._batch_positions)
                 all_answers = [correct_answer] + [w for w in wrong_answers if w and w != correct_answer]
                 all_answers = list(dict.fromkeys(all_answers))[:4]
                 while len(all_answers) < 4:
                     all_answers.append("")
-                random.shuffle(all_answers)
-                button_texts = all_answers
+                button_texts = [all_answers[j] for j in perm]
             else:
-                question_text = self._fmt_value(self.currentRow.get(meaning_field))
+                question_text = fmt(meaning_field)(row.get(meaning_field))
                 prompt_is_kanji = False
-                correct_answer = self._fmt_value(self.currentRow.get("kanji"))
+                correct_answer = fmt("kanji")(row.get("kanji"))
 
-                wrong_answers = self._collect_unique_field_distractors("kanji", correct_answer, self.currentQuestionBatch, needed=3)
+                wrong_answers = self._collect_unique_field_distractors("kanji", correct_answer, self.currentQuestionBatch, needed=3, batch_pos=self._batch_positions)
                 all_answers = [correct_answer] + [w for w in wrong_answers if w and w != correct_answer]
                 all_answers = list(dict.fromkeys(all_answers))[:4]
                 while len(all_answers) < 4:
                     all_answers.append("")
-                random.shuffle(all_answers)
-                button_texts = all_answers
+                button_texts = [all_answers[j] for j in perm]
 
         elif drill_type == "Reading":
             prefer = self.reading_type
@@ -1525,16 +2059,16 @@ class MainWindow(QMainWindow):
 
             if not correct_answer:
                 alt = self.currentRow.get("meanings") or self.currentRow.get("wk_meanings")
-                correct_answer = fmt_value(alt) or fmt_value(self.currentRow.get("kanji")) or ""
+                correct_answer = fmt_value(alt) or fmt("kanji")(row.get("kanji")) or ""
 
-            question_text = fmt_value(self.currentRow.get("kanji"))
+            question_text = fmt("kanji")(row.get("kanji"))
             prompt_is_kanji = True
 
             distractors = self._collect_reading_distractors(
                 self.currentQuestionBatch, is_jlpt, prefer, needed=3, exclude={correct_answer}
             )
 
-            if len(distractors) < 3 and hasattr(self, "currentSample") and self.currentSample is not None:
+            if len(distractors) < 3 and self.currentSample is not None:
                 more = self._collect_reading_distractors(
                     self.currentSample, is_jlpt, prefer, needed=10, exclude={correct_answer}
                 )
@@ -1554,11 +2088,10 @@ class MainWindow(QMainWindow):
                 ordered.append("")
             ordered = ordered[:4]
 
-            random.shuffle(ordered)
-            button_texts = ordered
+            button_texts = [ordered[j] for j in perm]
 
         else:
-            question_text = fmt_value(self.currentRow.get("kanji"))
+            question_text = fmt("kanji")(row.get("kanji"))
             prompt_is_kanji = True
             correct_answer = fmt_value(self.currentRow.get("meanings") or self.currentRow.get("wk_meanings"))
             wrong_answers = [fmt_value(r.get("meanings") or r.get("wk_meanings")) for _, r in self.currentQuestionBatch.iterrows()]
@@ -1567,27 +2100,11 @@ class MainWindow(QMainWindow):
             all_answers = list(dict.fromkeys(all_answers))[:4]
             while len(all_answers) < 4:
                 all_answers.append("")
-            random.shuffle(all_answers)
-            button_texts = all_answers
+            button_texts = [all_answers[j] for j in perm]
 
         self.current_question_prompt_is_kanji = prompt_is_kanji
         self.correct_answer_text = correct_answer
 
-        container = QWidget()
-        vlayout = QVBoxLayout(container)
-        vlayout.setSpacing(8)
-
-        qlabel = QLabel(question_text)
-        qlabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        qlabel.setWordWrap(True)
-        base_font = qlabel.font()
-        if prompt_is_kanji:
-            base_font.setPointSize(56)
-        else:
-            base_font.setPointSize(22)
-        qlabel.setFont(base_font)
-        vlayout.addWidget(qlabel)
-
         try:
             kanji_key = str(self.currentRow.get("kanji"))
             entry = self.kanji_stats.get(kanji_key, {})
@@ -1596,45 +2113,109 @@ class MainWindow(QMainWindow):
         except Exception:
             proficiency = 0.0
 
-        proficiency_lbl = QLabel(f"Proficiency: {int(round(proficiency))}%")
-        proficiency_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        vlayout.addWidget(proficiency_lbl)
+        return self._populate_question(question_text, prompt_is_kanji, proficiency, button_texts[:4], index, total_count)
 
-        answers_widget = QWidget()
-        answer_grid = QGridLayout(answers_widget)
-        answer_grid.setSpacing(6)
+    def _build_question_template(self):
+        container = QWidget()
+        vlayout = QVBoxLayout(container)
+        vlayout.setSpacing(8)
 
-        self.answer_buttons = []
+        self._q_label = QLabel("")
+        self._q_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._q_label.setWordWrap(True)
+        vlayout.addWidget(self._q_label)
 
+        self._q_proficiency_label = QLabel("")
+        self._q_proficiency_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        vlayout.addWidget(self._q_proficiency_label)
 
+        self._q_answers_widget = QWidget()
+        answer_grid = QGridLayout(self._q_answers_widget)
+        answer_grid.setSpacing(6)
+        self._q_buttons = []
+        for i in range(4):
+            btn = WrapButton("")
+            btn._is_correct = False
+            btn.clicked.connect(self._on_answer_clicked)
+            answer_grid.addWidget(btn, i // 2, i % 2)
+            self._q_buttons.append(btn)
+        vlayout.addWidget(self._q_answers_widget)
+
+        self._q_input_widget = QWidget()
+        input_row = QHBoxLayout(self._q_input_widget)
+        input_row.setContentsMargins(0, 0, 0, 0)
+        self.meaning_input = QLineEdit()
+        self.meaning_input.setPlaceholderText("Type a meaning…")
+        self.meaning_input.setClearButtonEnabled(True)
+        self.meaning_input.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.meaning_enter_btn = QPushButton("Enter")
+        self.meaning_enter_btn.setFixedWidth(90)
+        input_row.addWidget(self.meaning_input)
+        input_row.addWidget(self.meaning_enter_btn)
+        self.meaning_enter_btn.clicked.connect(self.submit_meaning_written)
+        self.meaning_input.returnPressed.connect(self.submit_meaning_written)
+        vlayout.addWidget(self._q_input_widget)
+
+        self._q_status_label = QLabel("")
+        self._q_status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        vlayout.addWidget(self._q_status_label)
+
+        self._q_container = container
+        return container
 
-        for i, text in enumerate(button_texts[:4]):
-            btn = WrapButton(text)
-            btn.setFont(self._answer_button_font_for_text(text))
-            is_correct = (text == self.correct_answer_text)
-            btn.clicked.connect(lambda checked=False, b=btn, correct=is_correct: self.checkAnswer(correct, b))
-            r = i // 2
-            c = i % 2
-            answer_grid.addWidget(btn, r, c)
-            self.answer_buttons.append(btn)
-
-        for i in range(len(button_texts), 4):
-            placeholder = WrapButton("")
-            placeholder.setEnabled(False)
-            placeholder.setMinimumHeight(80)
-            r = i // 2
-            c = i % 2
-            answer_grid.addWidget(placeholder, r, c)
-            self.answer_buttons.append(placeholder)
-
-        vlayout.addWidget(answers_widget)
-        display_index = index + 1
-        status_label = QLabel(f"{display_index}/{total_count}")
-        status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self._drill_status_label = status_label
-        vlayout.addWidget(status_label)
+    def _populate_question(self, question_text, prompt_is_kanji, proficiency, button_texts, index, total_count):
+        if self._q_container is None:
+            self._build_question_template()
+
+        self._q_label.setText(question_text)
+        if self._q_label_is_kanji is not prompt_is_kanji:
+            self._q_label.setFont(self._kanji_font if prompt_is_kanji else self._text_font)
+            self._q_label_is_kanji = prompt_is_kanji
+
+        self._q_proficiency_label.setText(f"Proficiency: {int(round(proficiency))}%")
+
+        if button_texts is None:
+            self._q_answers_widget.hide()
+            self._q_input_widget.show()
+            self.answer_buttons = []
+            self.meaning_input.clear()
+            self.meaning_input.setEnabled(True)
+            self.meaning_enter_btn.setEnabled(True)
+            QTimer.singleShot(50, self._focus_meaning_input)
+        else:
+            self._q_input_widget.hide()
+            self._q_answers_widget.show()
+            correct = self.correct_answer_text
+            for i, btn in enumerate(self._q_buttons):
+                text = button_texts[i] if i < len(button_texts) else ""
+                is_correct = text == correct
+                # blank padding slots stay visible but cannot be picked
+                has_text = bool(text) or is_correct
+                btn.setText(text)
+                btn_font = self._answer_button_font_for_text(text)
+                if getattr(btn, "_font_ref", None) is not btn_font:
+                    btn.setFont(btn_font)
+                    btn._font_ref = btn_font
+                if btn.styleSheet():
+                    btn.setStyleSheet("")
+                btn.setEnabled(has_text)
+                btn._is_correct = has_text and is_correct
+            self.answer_buttons = list(self._q_buttons)
+
+        self._q_status_label.setText(f"{index + 1}/{total_count}")
+        self._drill_status_label = self._q_status_label
+        return self._q_container
+
+    def _focus_meaning_input(self):
+        self.meaning_input.setFocus()
+        self.meaning_input.selectAll()
+
+    def _on_answer_clicked(self):
+        btn = self.sender()
+        if btn is None:
+            return
+        self.checkAnswer(btn._is_correct, btn)
 
-        return container
 
     def ensure_train_visible(self):
         if not hasattr(self, "TrainMainWidget") or self.TrainMainWidget is None:
@@ -1645,18 +2226,16 @@ class MainWindow(QMainWindow):
         if self.TrainMainWidget.layout() is None:
             self.TrainMainWidget.setLayout(self.TrainMainLayout)
         self.TrainMainWidget.show()
-        self.TrainMainWidget.repaint()
-        QApplication.processEvents()
 
     def DrillStart(self):
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self._apply_filters()
         if self.drillFilters["max_count"] < 1:
             QMessageBox.critical(self, "Error", "No cards available — choose at least one level.")
             return
 
-        if self.drillFilters["system"] == "JLPT":
-            self.df_f = self.build_filtered_df()
-        else:
-            self.df_f = self.build_filtered_df()
+        self.df_f = self.build_filtered_df()
 
         requested = int(self.drillFilters.get("count", 4) or 4)
         requested = max(4, requested)
@@ -1692,6 +2271,7 @@ class MainWindow(QMainWindow):
 
         self.drillFilters["count"] = final_count
         self.totalQuestions = int(self.drillFilters["count"])
+        self._prepare_question_randomness(self.totalQuestions)
         try:
             self._session_start_avg_prof = float(self.compute_average_proficiency_for_current_filter() or 0.0)
         except Exception:
@@ -1706,20 +2286,15 @@ class MainWindow(QMainWindow):
             return
 
         self.currentQuestionIndex = 0
-        self.session_results = []
+        self._start_session_results(self.totalQuestions)
         self.session_xp = {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}}
 
         self.ensure_train_visible()
         try:
             self.showQuestion()
         except Exception:
-            self.clear_layout(self.TrainMainLayout)
-            placeholder = QLabel("Error building question — check console")
-            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.TrainMainLayout.addWidget(placeholder)
-            placeholder.show()
+            self._show_question_error("Error building question — check console")
             self.TrainMainWidget.show()
-            QApplication.processEvents()
 
         try:
             self._start_session_timer()
@@ -1728,68 +2303,46 @@ class MainWindow(QMainWindow):
 
         self.stack.slide_to(2, "left")
 
-    def _pw_weight_for_row(self, row):
-        try:
-            kanji_key = str(row.get("kanji"))
-        except Exception:
-            kanji_key = ""
-
-        if kanji_key:
-            self.ensure_kanji_entry(kanji_key)
-
+    def _pw_weights(self, kanji_keys):
         system_name = self.drillFilters["system"]
-        drill_name = self.drillFilters["drill"]
-
-        bucket = None
-        try:
-            mode_key = self._current_mode_key()
-            bucket = self.kanji_stats.get(kanji_key, {}).get(system_name, {}).get(mode_key, {})
-        except Exception:
-            bucket = {}
+        mode_key = self._current_mode_key()
 
-        r = int(bucket.get("pw_right", 0) or 0)
-        w = int(bucket.get("pw_wrong", 0) or 0)
-        last = int(bucket.get("pw_last_seen", 0) or 0)
+        n = len(kanji_keys)
+        right = np.empty(n, dtype=np.float64)
+        wrong = np.empty(n, dtype=np.float64)
+        last = np.empty(n, dtype=np.float64)
+        last_sess = np.empty(n, dtype=np.float64)
+        # kanji that were never answered count as all zeros; entries are only
+        # created when an answer is recorded
+        stats = self.kanji_stats
+        for i, kanji_key in enumerate(kanji_keys):
+            entry = stats.get(str(kanji_key)) or {}
+            bucket = (entry.get(system_name) or {}).get(mode_key) or {}
+            right[i] = int(bucket.get("pw_right", 0) or 0)
+            wrong[i] = int(bucket.get("pw_wrong", 0) or 0)
+            last[i] = int(bucket.get("pw_last_seen", 0) or 0)
+            last_sess[i] = int(bucket.get("pw_last_seen_session", 0) or 0)
 
-        last_sess = int(bucket.get("pw_last_seen_session", 0) or 0)
         now_sess = int(self.profile_data.get("pw_session_counter", 0) or 0)
-        sess_age = max(0, now_sess - last_sess)
+        sess_age = np.maximum(0.0, now_sess - last_sess)
 
-        wrong_rate = (w + 1.0) / (r + w + 2.0)
+        wrong_rate = (wrong + 1.0) / (right + wrong + 2.0)
 
         now = int(self.profile_data.get("pw_question_counter", 0) or 0)
-        age = max(0, now - last)
+        age = np.maximum(0.0, now - last)
 
         cap = 200.0
-        stale_mult = 1.0 + min(age, cap) / cap
+        stale_mult = 1.0 + np.minimum(age, cap) / cap
 
         cool_sess = int(getattr(self, "_pw_cooldown_sessions", 0) or 0)
-        if cool_sess > 0 and sess_age <= cool_sess:
-            session_cooldown_factor = 0.20 + 0.80 * (sess_age / float(cool_sess))
+        if cool_sess > 0:
+            session_cooldown_factor = np.where(sess_age <= cool_sess, 0.20 + 0.80 * (sess_age / float(cool_sess)), 1.0)
         else:
             session_cooldown_factor = 1.0
 
         floor = 0.08
         weight = (floor + (wrong_rate * stale_mult)) * session_cooldown_factor
-        return max(0.0001, float(weight))
-
-
-    def _weighted_choice_index(self, indices, weights):
-        total = 0.0
-        for w in weights:
-            total += float(w)
-
-        if total <= 0.0:
-            return random.randrange(len(indices))
-
-        r = random.random() * total
-        acc = 0.0
-        for i, w in enumerate(weights):
-            acc += float(w)
-            if acc >= r:
-                return i
-        return len(indices) - 1
-
+        return np.maximum(0.0001, weight)
 
     def get_pw_weighted_sample(self, df, n):
         try:
@@ -1799,18 +2352,8 @@ class MainWindow(QMainWindow):
             n = int(n)
             n = max(1, min(n, len(df)))
 
-            rows = []
-            weights = []
-            for pos, (idx, row) in enumerate(df.iterrows()):
-                rows.append((pos, row))
-                weights.append(self._pw_weight_for_row(row))
-
-            chosen_positions = []
-            for _ in range(n):
-                pick_pos = self._weighted_choice_index(list(range(len(rows))), weights)
-                pos, _row = rows.pop(pick_pos)
-                weights.pop(pick_pos)
-                chosen_positions.append(pos)
+            weights = self._pw_weights(getColumns(df)["kanji"])
+            chosen_positions = weightedSample(weights, n)
 
             sampled = df.iloc[chosen_positions].copy()
             sampled = sampled.reset_index(drop=True)
@@ -1821,20 +2364,21 @@ class MainWindow(QMainWindow):
                 return getRandomSample(df, n)
             except Exception:
                 return df
-            
+
     def compute_average_proficiency_for_current_filter(self):
         if getattr(self, "df_f", None) is None or len(self.df_f) == 0:
             return 0.0
         mode_key = self._current_mode_key()
+        system_name = self.drillFilters["system"]
         total = 0.0
         count = 0
-        for _, row in self.df_f.iterrows():
-            k = str(row.get("kanji") or "")
+        for k in getColumns(self.df_f).get("kanji", ()):
+            k = str(k or "")
             if not k:
                 continue
             entry = self.kanji_stats.get(k, {})
             try:
-                system_blob = entry.get(self.drillFilters["system"], {})
+                system_blob = entry.get(system_name, {})
                 bucket = system_blob.get(mode_key, {})
                 m = float(bucket.get("mastery", 0.0) or 0.0)
             except Exception:
@@ -1855,7 +2399,7 @@ class MainWindow(QMainWindow):
             self.finishTraining()
             return
 
-        self.clear_layout(self.TrainMainLayout)
+        self.answer_buttons = []
         qwidget = None
         try:
             qwidget = self.NewDrillQuestion(index=self.currentQuestionIndex, total_count=self.totalQuestions)
@@ -1865,21 +2409,30 @@ class MainWindow(QMainWindow):
             qwidget = None
 
         if qwidget is None:
-            placeholder = QLabel("Could not build question — check console")
-            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.TrainMainLayout.addWidget(placeholder)
-            placeholder.show()
-        else:
+            self._show_question_error("Could not build question — check console")
+        elif self.TrainMainLayout.indexOf(qwidget) < 0:
+            self.clear_layout(self.TrainMainLayout)
             qwidget.setParent(self.TrainMainWidget)
             self.TrainMainLayout.addWidget(qwidget)
             qwidget.show()
 
         self.TrainMainWidget.show()
-        self.TrainMainWidget.repaint()
-        QApplication.processEvents()
+
+    def _show_question_error(self, text):
+        label = self._q_error_label
+        if label is None:
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self._q_error_label = label
+        label.setText(text)
+        if self.TrainMainLayout.indexOf(label) < 0:
+            self.clear_layout(self.TrainMainLayout)
+            label.setParent(self.TrainMainWidget)
+            self.TrainMainLayout.addWidget(label)
+        label.show()
 
     def _create_overlay(self):
-        if getattr(self, "_train_overlay", None) is not None:
+        if self._train_overlay is not None:
             return
         overlay = QWidget(self.TrainMainWidget)
         overlay.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
@@ -1890,16 +2443,23 @@ class MainWindow(QMainWindow):
         msg_label = QLabel("", overlay)
         msg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         msg_label.setWordWrap(True)
-        msg_font = QFont()
-        msg_font.setPointSize(26)
-        msg_label.setFont(msg_font)
+        msg_label.setFont(self._overlay_font)
         msg_label.setStyleSheet("color: white;")
         overlay_layout.addStretch()
         overlay_layout.addWidget(msg_label)
         overlay_layout.addStretch()
+        overlay.setGeometry(self.TrainMainWidget.rect())
+        overlay.hide()
         self._train_overlay = overlay
         self._train_overlay_label = msg_label
-        overlay.hide()
+        self.TrainMainWidget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and obj is self.TrainMainWidget:
+            overlay = self._train_overlay
+            if overlay is not None:
+                overlay.setGeometry(obj.rect())
+        return super().eventFilter(obj, event)
 
     def show_overlay(self, text=None, timeout_ms=None, is_correct: Optional[bool] = None, answers: Optional[str] = None):
         def _esc(s):
@@ -1924,8 +2484,7 @@ class MainWindow(QMainWindow):
                 t_ms = 1500
 
         if t_ms <= 0:
-            QApplication.processEvents()
-            QTimer.singleShot(0, lambda: self._advance_after_popup())
+            QTimer.singleShot(0, self._advance_after_popup)
             return
 
         self._create_overlay()
@@ -1954,30 +2513,12 @@ class MainWindow(QMainWindow):
         label.setTextFormat(Qt.RichText)
         label.setText(html)
 
-        overlay.setGeometry(self.TrainMainWidget.rect())
         overlay.raise_()
         overlay.show()
-        overlay.repaint()
-        QApplication.processEvents()
-        QTimer.singleShot(t_ms, lambda: (overlay.hide(), self._advance_after_popup()))
+        QTimer.singleShot(t_ms, self._hide_overlay_and_advance)
 
 
     def ensure_kanji_entry(self, kanji_key):
-        def bucket_defaults():
-            return {
-                "right": 0,
-                "wrong": 0,
-                "streak": 0,
-                "pw_right": 0,
-                "pw_wrong": 0,
-                "pw_streak": 0,
-                "pw_last_seen": 0,
-                "pw_last_seen_session": 0,
-                "mastery": 0.0,
-                "mastery_streak": 0,
-                "mastery_last_seen": 0
-            }
-
         if kanji_key not in self.kanji_stats:
             self.kanji_stats[kanji_key] = {
                 "total_encounters": 0,
@@ -1995,7 +2536,7 @@ class MainWindow(QMainWindow):
             entry.setdefault(sysn, {})
             for m in modes:
                 if m not in entry[sysn]:
-                    entry[sysn][m] = bucket_defaults().copy()
+                    entry[sysn][m] = dict(_BUCKET_DEFAULTS)
                 else:
                     b = entry[sysn][m]
                     b.setdefault("right", 0)
@@ -2015,10 +2556,13 @@ class MainWindow(QMainWindow):
     def update_stats_and_profile(self, kanji_key, is_correct):
         system_name = self.drillFilters["system"]
         drill_name = self.drillFilters["drill"]
+        profile = self.profile_data
 
         self.ensure_kanji_entry(kanji_key)
         entry = self.kanji_stats[kanji_key]
-        entry["total_encounters"] = int(entry.get("total_encounters", 0)) + 1
+        entry["total_encounters"] += 1
+        if self._total_encounters is not None:
+            self._total_encounters += 1
 
         try:
             self._record_one_question_now()
@@ -2026,57 +2570,48 @@ class MainWindow(QMainWindow):
             pass
 
         mode_key = self._current_mode_key()
-        bucket = entry[system_name].setdefault(mode_key, {})
-        bucket.setdefault("right", 0)
-        bucket.setdefault("wrong", 0)
-        bucket.setdefault("streak", 0)
-        bucket.setdefault("pw_right", 0)
-        bucket.setdefault("pw_wrong", 0)
-        bucket.setdefault("pw_streak", 0)
-        bucket.setdefault("pw_last_seen", 0)
-        bucket.setdefault("pw_last_seen_session", 0)
-        bucket.setdefault("mastery", 0.0)
-        bucket.setdefault("mastery_streak", 0)
-        bucket.setdefault("mastery_last_seen", 0)
+        sys_entry = entry[system_name]
+        bucket = sys_entry.get(mode_key)
+        if bucket is None:
+            bucket = sys_entry[mode_key] = dict(_BUCKET_DEFAULTS)
 
         if is_correct:
-            bucket["right"] = int(bucket.get("right", 0)) + 1
-            bucket["streak"] = int(bucket.get("streak", 0)) + 1
+            bucket["right"] += 1
+            bucket["streak"] += 1
         else:
-            bucket["wrong"] = int(bucket.get("wrong", 0)) + 1
+            bucket["wrong"] += 1
             bucket["streak"] = 0
 
-        if bool(self.drillFilters.get("prioritize_weakness", True)):
+        if self.drillFilters.get("prioritize_weakness", True):
             try:
-                self.profile_data["pw_question_counter"] = int(self.profile_data.get("pw_question_counter", 0)) + 1
+                now = int(profile.get("pw_question_counter", 0) or 0) + 1
             except Exception:
-                self.profile_data["pw_question_counter"] = 1
+                now = 1
+            profile["pw_question_counter"] = now
 
-            now = int(self.profile_data.get("pw_question_counter", 0))
             bucket["pw_last_seen"] = now
             try:
-                bucket["pw_last_seen_session"] = int(getattr(self, "_pw_current_session_id", 0) or 0)
+                bucket["pw_last_seen_session"] = int(self._pw_current_session_id or 0)
             except Exception:
                 bucket["pw_last_seen_session"] = 0
 
             if is_correct:
-                bucket["pw_right"] = int(bucket.get("pw_right", 0)) + 1
-                bucket["pw_streak"] = int(bucket.get("pw_streak", 0)) + 1
+                bucket["pw_right"] += 1
+                bucket["pw_streak"] += 1
             else:
-                bucket["pw_wrong"] = int(bucket.get("pw_wrong", 0)) + 1
+                bucket["pw_wrong"] += 1
                 bucket["pw_streak"] = 0
 
             try:
-                mastery = float(bucket.get("mastery", 0.0) or 0.0)
+                mastery = float(bucket["mastery"] or 0.0)
             except Exception:
                 mastery = 0.0
 
-            now_q = int(self.profile_data.get("pw_question_counter", 0) or 0)
-            last_seen_q = int(bucket.get("mastery_last_seen", 0) or 0)
+            last_seen_q = bucket["mastery_last_seen"] or 0
 
             age = 0
             if last_seen_q > 0:
-                age = max(0, now_q - last_seen_q)
+                age = max(0, now - last_seen_q)
 
             MIN_AGE_FOR_DECAY = 20
             if age >= MIN_AGE_FOR_DECAY:
@@ -2090,20 +2625,14 @@ class MainWindow(QMainWindow):
 
             if is_correct:
                 base_gain = 3.5 if drill_name == "Reading" else 2.5
-                gain = base_gain * (1.0 - (mastery / 100.0))
+                # prioritize_weakness is on in this branch, so gains are halved
+                gain = base_gain * (1.0 - (mastery / 100.0)) * 0.5
 
-                try:
-                    if bool(self.drillFilters.get("prioritize_weakness", True)):
-                        gain = gain * 0.5
-                except Exception:
-                    pass
-
-                bucket["mastery_streak"] = int(bucket.get("mastery_streak", 0)) + 1
+                streak = bucket["mastery_streak"] + 1
+                bucket["mastery_streak"] = streak
                 mastery += gain
                 if mastery >= 99.0:
-                    streak = int(bucket.get("mastery_streak", 0))
-                    total_enc = int(entry.get("total_encounters", 0) or 0)
-                    if streak >= 7 and total_enc >= 25:
+                    if streak >= 7 and entry["total_encounters"] >= 25:
                         mastery = 100.0
                     else:
                         mastery = min(mastery, 99.0)
@@ -2112,32 +2641,25 @@ class MainWindow(QMainWindow):
                 mastery = max(0.0, mastery - penalty)
                 bucket["mastery_streak"] = 0
 
-            bucket["mastery"] = round(float(mastery), 2)
-            bucket["mastery_last_seen"] = int(self.profile_data.get("pw_question_counter", 0) or 0)
+            bucket["mastery"] = round(mastery, 2)
+            bucket["mastery_last_seen"] = now
 
         gained = self.xp_for_answer(system_name, drill_name, is_correct)
-        self.profile_data["xp"][system_name][drill_name] = int(self.profile_data["xp"][system_name][drill_name]) + int(gained)
-        self.session_xp[system_name][drill_name] = int(self.session_xp[system_name][drill_name]) + int(gained)
+        profile["xp"][system_name][drill_name] += gained
+        self.session_xp[system_name][drill_name] += gained
 
-        self.save_stats()
-        self.save_profile()
+        self._schedule_save(kanji_key, [("xp", system_name, drill_name), ("pw_question_counter",)])
 
     def checkAnswer(self, is_correct, clicked_button):
-        for b in getattr(self, "answer_buttons", []):
-            try:
-                b.setEnabled(False)
-            except Exception:
-                pass
+        for b in self.answer_buttons:
+            b.setEnabled(False)
 
-        try:
-            kanji_key = str(self.currentRow.get("kanji"))
-        except Exception:
-            kanji_key = ""
+        kanji_key = str(self.currentRow.get("kanji"))
 
         given_text = clicked_button.text() if clicked_button is not None else ""
-        expected_text = getattr(self, "correct_answer_text", "")
+        expected_text = self.correct_answer_text
 
-        self.session_results.append({"kanji": kanji_key, "given": given_text, "expected": expected_text, "correct": bool(is_correct)})
+        self._record_result({"kanji": kanji_key, "given": given_text, "expected": expected_text, "correct": bool(is_correct)})
 
         self.update_stats_and_profile(kanji_key, bool(is_correct))
 
@@ -2149,7 +2671,7 @@ class MainWindow(QMainWindow):
                     pass
             self.show_overlay(is_correct=True, answers=expected_text)
         else:
-            for b in getattr(self, "answer_buttons", []):
+            for b in self.answer_buttons:
                 try:
                     if b.text() == expected_text:
                         b.setStyleSheet("background-color: lightgreen;")
@@ -2165,30 +2687,52 @@ class MainWindow(QMainWindow):
             self.show_overlay(is_correct=False, answers=expected_text)
 
 
+    def _hide_overlay_and_advance(self):
+        self._train_overlay.hide()
+        self._advance_after_popup()
+
     def _advance_after_popup(self):
         self.currentQuestionIndex += 1
-        try:
-            if hasattr(self, "_drill_status_label") and self._drill_status_label is not None:
-                display_index = min(self.currentQuestionIndex + 1, self.totalQuestions)
-                self._drill_status_label.setText(f"{display_index}/{self.totalQuestions}")
-        except Exception:
-            pass
+        if self._drill_status_label is not None:
+            display_index = min(self.currentQuestionIndex + 1, self.totalQuestions)
+            self._drill_status_label.setText(f"{display_index}/{self.totalQuestions}")
         self.showQuestion()
 
     def _current_mode_key(self):
         dr = self.drillFilters.get("drill", "Meaning")
         if dr == "Meaning":
-            mode = "writing" if getattr(self, "meaning_mode", "multiple_choice") == "writing" else "multiple_choice"
+            mode = "writing" if self.meaning_mode == "writing" else "multiple_choice"
             return f"Meaning:{mode}"
         else:
-            rt = getattr(self, "reading_type", "kunyomi")
+            rt = self.reading_type
             return f"Reading:{rt}"
 
+    def _start_session_results(self, n):
+        self.session_results = [None] * max(int(n), 0)
+        self._session_idx = 0
+        self._session_correct = 0
+        self._session_wrongs = []
+
+    def _record_result(self, result):
+        idx = self._session_idx
+        if idx < len(self.session_results):
+            self.session_results[idx] = result
+        else:
+            self.session_results.append(result)
+        self._session_idx = idx + 1
+        if result.get("correct"):
+            self._session_correct += 1
+        else:
+            self._session_wrongs.append(result)
+
     def finishTraining(self):
         try:
             self._stop_session_timer_and_record()
         except Exception:
             pass
+        self._save_timer.stop()
+        self._flush_saves()
+        del self.session_results[self._session_idx:]
         self.build_results_page()
         idx = self.results_index()
         if idx is None:
@@ -2240,51 +2784,23 @@ class MainWindow(QMainWindow):
             actions_h.addStretch()
             layout.addLayout(actions_h)
 
-            scroll = QScrollArea()
-            scroll.setWidgetResizable(True)
-            container = QWidget()
-            self._results_list_layout = QVBoxLayout(container)
-            self._results_list_layout.setContentsMargins(6, 6, 6, 6)
-            self._results_list_layout.setSpacing(8)
-            scroll.setWidget(container)
-
-            layout.addWidget(scroll)
+            self._results_model = _ResultsModel()
+            self._results_list_view = QListView()
+            self._results_list_view.setModel(self._results_model)
+            self._results_list_view.setUniformItemSizes(True)
+            self._results_list_view.setWordWrap(True)
+            self._results_list_view.setSpacing(4)
+            self._results_list_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+            self._results_list_view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+            layout.addWidget(self._results_list_view)
 
             page = QWidget()
             page.setLayout(layout)
             self._results_page = page
-            self.stack.addWidget(self._results_page)
+            self._results_page_index = self.stack.addWidget(self._results_page)
 
-        elif not hasattr(self, "_results_list_layout") or self._results_list_layout is None:
-            try:
-                page_layout = self._results_page.layout()
-                scroll_found = None
-                for i in range(page_layout.count()):
-                    item = page_layout.itemAt(i)
-                    widget = item.widget() if item is not None else None
-                    if isinstance(widget, QScrollArea):
-                        scroll_found = widget
-                        break
-                if scroll_found is not None:
-                    container = QWidget()
-                    self._results_list_layout = QVBoxLayout(container)
-                    self._results_list_layout.setContentsMargins(6, 6, 6, 6)
-                    self._results_list_layout.setSpacing(8)
-                    scroll_found.setWidget(container)
-                else:
-                    scroll = QScrollArea()
-                    scroll.setWidgetResizable(True)
-                    container = QWidget()
-                    self._results_list_layout = QVBoxLayout(container)
-                    self._results_list_layout.setContentsMargins(6, 6, 6, 6)
-                    self._results_list_layout.setSpacing(8)
-                    scroll.setWidget(container)
-                    page_layout.addWidget(scroll)
-            except Exception:
-                self._results_list_layout = QVBoxLayout()
-        
         total = len(self.session_results)
-        correct_count = sum(1 for r in self.session_results if r.get("correct"))
+        correct_count = self._session_correct
         percent = int((correct_count / total) * 100) if total > 0 else 0
         self._results_percent_label.setText(f"{percent}%")
         self._results_count_label.setText(f"{correct_count}/{total} correct")
@@ -2303,102 +2819,19 @@ class MainWindow(QMainWindow):
         gained = int(self.session_xp.get(s, {}).get(d, 0))
         self._results_xp_label.setText(f"Session XP ({s} / {d}): +{gained}    Filter avg: {end_avg:.3f}% ( {delta_text})")
 
-        try:
-            while self._results_list_layout.count():
-                item = self._results_list_layout.takeAt(0)
-                if item is None:
-                    continue
-                w = item.widget()
-                if w:
-                    w.setParent(None)
-                else:
-                    nested = item.layout()
-                    if nested:
-                        while nested.count():
-                            it2 = nested.takeAt(0)
-                            w2 = it2.widget()
-                            if w2:
-                                w2.setParent(None)
-        except Exception:
-            pass
-
-        wrongs = [r for r in self.session_results if not r.get("correct")]
-        if not wrongs:
-            lbl = QLabel("No wrong answers — great job!")
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self._results_list_layout.addWidget(lbl)
-        else:
-            for r in wrongs:
-                frame = QFrame()
-                frame.setFrameShape(QFrame.StyledPanel)
-                f_layout = QHBoxLayout(frame)
-                kanji_lbl = QLabel(str(r.get("kanji", "")))
-                kanji_lbl.setFixedWidth(80)
-                kanji_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                expected_lbl = QLabel("Expected: " + str(r.get("expected", "")))
-                expected_lbl.setWordWrap(True)
-                f_layout.addWidget(kanji_lbl)
-                f_layout.addWidget(expected_lbl)
-                self._results_list_layout.addWidget(frame)
-
-        try:
-            self._results_list_layout.addStretch()
-        except Exception:
-            pass
-
-
-        total = len(self.session_results)
-        correct_count = sum(1 for r in self.session_results if r.get("correct"))
-        percent = int((correct_count / total) * 100) if total > 0 else 0
-        self._results_percent_label.setText(f"{percent}%")
-        self._results_count_label.setText(f"{correct_count}/{total} correct")
-
-        try:
-            end_avg = float(self.compute_average_proficiency_for_current_filter() or 0.0)
-        except Exception:
-            end_avg = 0.0
-        start_avg = float(self._session_start_avg_prof or 0.0)
-        delta = end_avg - start_avg
-        sign = "+" if delta >= 0 else "-"
-        delta_text = f"{sign}{abs(delta):.3f}%"
-       
-        s = self.drillFilters["system"]
-        d = self.drillFilters["drill"]
-        gained = int(self.session_xp.get(s, {}).get(d, 0))
-        self._results_xp_label.setText(f"Session XP ({s} / {d}): +{gained}    Filter avg: {end_avg:.3f}% ( {delta_text})")
-
-        while self._results_list_layout.count():
-            item = self._results_list_layout.takeAt(0)
-            w = item.widget()
-            if w:
-                w.setParent(None)
-
-        wrongs = [r for r in self.session_results if not r.get("correct")]
-        if not wrongs:
-            lbl = QLabel("No wrong answers — great job!")
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self._results_list_layout.addWidget(lbl)
-        else:
-            for r in wrongs:
-                frame = QFrame()
-                frame.setFrameShape(QFrame.StyledPanel)
-                f_layout = QHBoxLayout(frame)
-                kanji_lbl = QLabel(str(r.get("kanji", "")))
-                kanji_lbl.setFixedWidth(80)
-                kanji_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                expected_lbl = QLabel("Expected: " + str(r.get("expected", "")))
-                expected_lbl.setWordWrap(True)
-                f_layout.addWidget(kanji_lbl)
-                f_layout.addWidget(expected_lbl)
-                self._results_list_layout.addWidget(frame)
-        self._results_list_layout.addStretch()
+        wrongs = [(str(r.get("kanji", "")), str(r.get("expected", "")))
+                  for r in self._session_wrongs]
+        self._results_model.set_rows(wrongs)
 
     def change_profile_pfp(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Choose Profile Picture", "", "Images (*.png *.jpg *.jpeg *.webp *.bmp *.gif)")
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Choose Profile Picture", "", "Images (*.png *.jpg *.jpeg *.webp *.bmp *.gif)",
+            options=QFileDialog.Option.DontResolveSymlinks | QFileDialog.Option.DontUseCustomDirectoryIcons,
+        )
         if not path:
             return
         ext = os.path.splitext(path)[1].lower()
-        if ext not in [".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif"]:
+        if ext not in _IMG_EXTS:
             return
         new_local_name = os.path.join(self.appdata, "pfp" + ext)
         try:
@@ -2406,15 +2839,15 @@ class MainWindow(QMainWindow):
         except Exception:
             QMessageBox.warning(self, "Error", "Could not copy the selected image.")
             return
+        self._pfp_exists_cache[new_local_name] = True
         self.profile_data["pfp_path"] = new_local_name
         self.save_profile()
         try:
-            pix = QPixmap(new_local_name).scaledToHeight(215, Qt.SmoothTransformation)
+            pix = self._get_scaled_pfp(new_local_name)
             if hasattr(self, "profilePFP"):
                 self.profilePFP.setPixmap(pix)
-            main_pix = QPixmap(new_local_name).scaledToHeight(215, Qt.SmoothTransformation)
-            self.mainMenuPFP.setPixmap(main_pix)
-            self.mainMenuPFP.setFixedSize(main_pix.width(), main_pix.height())
+            self.mainMenuPFP.setPixmap(pix)
+            self.mainMenuPFP.setFixedSize(pix.width(), pix.height())
         except Exception:
             pass
 
@@ -2438,14 +2871,7 @@ class MainWindow(QMainWindow):
             layout.addLayout(back_layout)
 
             self.profilePFP = ClickableLabel()
-            pix_path = self.profile_data.get("pfp_path", resource_path("pfp.png"))
-            try:
-                pix = QPixmap(pix_path)
-                if pix.isNull():
-                    pix = QPixmap(resource_path("pfp.png"))
-            except Exception:
-                pix = QPixmap(resource_path("pfp.png"))
-            pix = pix.scaledToHeight(215, Qt.SmoothTransformation)
+            pix = self._load_pfp()
             self.profilePFP.setAlignment(Qt.AlignmentFlag.AlignHCenter)
             self.profilePFP.setPixmap(pix)
             self.profilePFP.set_on_click(self.change_profile_pfp)
@@ -2485,6 +2911,7 @@ class MainWindow(QMainWindow):
             grid = QGridLayout()
             grid.setSpacing(8)
             self.profileBuckets = {}
+            self._profile_bucket_xp_shown = {}
             buckets = [("JLPT", "Meaning"), ("JLPT", "Reading"), ("WaniKani", "Meaning"), ("WaniKani", "Reading")]
             for i, (system_name, drill_name) in enumerate(buckets):
                 block = QFrame()
@@ -2512,9 +2939,10 @@ class MainWindow(QMainWindow):
             page = QWidget()
             page.setLayout(layout)
             self._profile_page = page
-            self.stack.addWidget(self._profile_page)
+            self._profile_page_index = self.stack.addWidget(self._profile_page)
 
-        self.refresh_profile_page()
+        # about to slide in, so refresh before the transition snapshot is taken
+        self.refresh_profile_page(force=True)
 
     def _start_new_session_from_results(self):
         try:
@@ -2523,7 +2951,7 @@ class MainWindow(QMainWindow):
             idx = 1
             self.stack.slide_to(idx, "right")
     def _repeat_failures_from_results(self):
-        wrongs = [r.get("kanji") for r in self.session_results if not r.get("correct")]
+        wrongs = [r.get("kanji") for r in self._session_wrongs]
         seen = set()
         wrongs_unique = []
         for k in wrongs:
@@ -2551,23 +2979,15 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Repeat Failures", "Could not build a failure-only session (no reference dataset).")
             return
 
-        try:
-            mask = base_df["kanji"].isin(wrongs_unique)
-            df_failures = base_df.loc[mask].copy()
-            df_failures["__order_tmp"] = df_failures["kanji"].apply(lambda k: wrongs_unique.index(k) if k in wrongs_unique else 9999)
-            df_failures = df_failures.sort_values("__order_tmp").drop(columns=["__order_tmp"])
-            df_failures = base_df[base_df["kanji"].isin(wrongs_unique)].copy()
-            df_failures = df_failures.reset_index(drop=True)
-        except Exception:
-            df_failures = base_df[base_df["kanji"].isin(wrongs_unique)].copy()
-            df_failures = df_failures.reset_index(drop=True)
+        mask = base_df["kanji"].isin(wrongs_unique).to_numpy()
+        df_failures = base_df.iloc[mask.nonzero()[0]].reset_index(drop=True)
 
         n_fail = int(getattr(df_failures, "shape", (0, 0))[0])
 
         allow_under_four = False
         try:
             if self.drillFilters.get("drill", "Meaning") == "Meaning":
-                if getattr(self, "meaning_mode", "multiple_choice") == "writing":
+                if self.meaning_mode == "writing":
                     allow_under_four = True
         except Exception:
             pass
@@ -2609,8 +3029,9 @@ class MainWindow(QMainWindow):
         self.currentSample = df_failures.copy().reset_index(drop=True)
 
         self.totalQuestions = int(len(self.currentSample))
+        self._prepare_question_randomness(self.totalQuestions)
         self.currentQuestionIndex = 0
-        self.session_results = []
+        self._start_session_results(self.totalQuestions)
         self.session_xp = {"JLPT": {"Meaning": 0, "Reading": 0}, "WaniKani": {"Meaning": 0, "Reading": 0}}
 
         self.ensure_train_visible()
@@ -2626,12 +3047,15 @@ class MainWindow(QMainWindow):
             return
         
     def _on_stack_changed(self, index: int):
+        if index == self._profile_page_index:
+            if self._pending_saves or self._dirty_kanji or self._dirty_profile_keys:
+                self._save_timer.stop()
+                self._flush_saves()
+            if self._profile_dirty:
+                self.refresh_profile_page()
         if index == 1:
             try:
-                if self.drillFilters["system"] == "JLPT":
-                    self.df_f = self.build_filtered_df()
-                else:
-                    self.df_f = self.build_filtered_df()
+                self.df_f = self.build_filtered_df()
             except Exception:
                 pass
             try:
@@ -2646,13 +3070,42 @@ class MainWindow(QMainWindow):
             return ", ".join(str(x) for x in v if x is not None)
         return str(v)
 
-    def _collect_unique_field_distractors(self, field_name, correct, batch_df, needed=3):
+    def _sample_cache(self):
+        sample = self.currentSample
+        if self._fmt_sample is not sample:
+            self._fmt_sample = sample
+            self._fmt_cols = {}
+            self._fmt_fn = {}
+        return sample
+
+    def _field_formatter(self, field_name):
+        sample = self._sample_cache()
+        fn = self._fmt_fn.get(field_name)
+        if fn is None:
+            if sample is None or field_name not in getattr(sample, "columns", ()):
+                return self._fmt_value
+            first = next((v for v in sample[field_name].tolist() if v is not None), None)
+            fn = _format_list if isinstance(first, (list, tuple)) else _format_scalar
+            self._fmt_fn[field_name] = fn
+        return fn
+
+    def _formatted_column(self, field_name):
+        sample = self._sample_cache()
+        if sample is None or field_name not in getattr(sample, "columns", ()):
+            return None
+        col = self._fmt_cols.get(field_name)
+        if col is None:
+            fn = self._field_formatter(field_name)
+            col = np.array([fn(v).strip() for v in sample[field_name].tolist()], dtype=object)
+            self._fmt_cols[field_name] = col
+        return col
+
+    def _collect_unique_field_distractors(self, field_name, correct, batch_df, needed=3, batch_pos=None):
 
         seen = set()
         results = []
 
-        def try_add(val):
-            s = self._fmt_value(val).strip()
+        def try_add(s):
             if not s:
                 return
             if s == correct:
@@ -2662,28 +3115,27 @@ class MainWindow(QMainWindow):
             seen.add(s)
             results.append(s)
 
-        try:
-            if batch_df is not None:
-                for _, r in batch_df.iterrows():
-                    try_add(r.get(field_name))
-                    if len(results) >= needed:
-                        return results[:needed]
-        except Exception:
-            pass
-
-        try:
-            if getattr(self, "currentSample", None) is not None:
-                for _, r in self.currentSample.iterrows():
-                    try_add(r.get(field_name))
-                    if len(results) >= needed:
-                        return results[:needed]
-        except Exception:
-            pass
+        formatted = self._formatted_column(field_name)
+        if formatted is not None:
+            batch_values = formatted[batch_pos] if batch_pos is not None else ()
+            for s in itertools.chain(batch_values, formatted):
+                try_add(s)
+                if len(results) >= needed:
+                    return results[:needed]
+        else:
+            try:
+                if batch_df is not None:
+                    for _, r in batch_df.iterrows():
+                        try_add(self._fmt_value(r.get(field_name)).strip())
+                        if len(results) >= needed:
+                            return results[:needed]
+            except Exception:
+                pass
 
         try:
             if getattr(self, "df_f", None) is not None:
-                for _, r in self.df_f.iterrows():
-                    try_add(r.get(field_name))
+                for v in getColumns(self.df_f).get(field_name, ()):
+                    try_add(self._fmt_value(v).strip())
                     if len(results) >= needed:
                         return results[:needed]
         except Exception:
@@ -2698,44 +3150,58 @@ class MainWindow(QMainWindow):
         dlg.show()
         dlg.raise_()
 
-    def refresh_profile_page(self):
-        if getattr(self, "_profile_page", None) is None:
+    def refresh_profile_page(self, force=False):
+        page = self._profile_page
+        if page is None:
             return
+        if not force and self.stack.currentWidget() is not page:
+            self._profile_dirty = True
+            return
+        self._profile_dirty = False
+        page.setUpdatesEnabled(False)
         try:
-            self.profileNameEdit.setText(self.profile_data.get("username", "User"))
-        except Exception:
-            pass
-        self.profileTotalQuestions.setText(f"Total Questions Answered: {self.total_questions_answered_overall()}")
-        try:
-            today = time.strftime("%Y-%m-%d")
-            act = self.profile_data.get("activity", {}) or {}
-            today_entry = act.get(today, {"questions": 0, "seconds": 0})
-            q = int(today_entry.get("questions", 0) or 0)
-            secs = int(today_entry.get("seconds", 0) or 0)
-            h = secs // 3600
-            m = (secs % 3600) // 60
-            if h > 0:
-                timestr = f"{h}h {m}m"
-            else:
-                timestr = f"{m}m"
-            self.profileTodaySummary.setText(f"Today: {q} questions — {timestr}")
-        except Exception:
-            self.profileTodaySummary.setText("")
+            try:
+                self.profileNameEdit.setText(self.profile_data.get("username", "User"))
+            except Exception:
+                pass
+            self.profileTotalQuestions.setText(f"Total Questions Answered: {self.total_questions_answered_overall()}")
+            try:
+                today = time.strftime("%Y-%m-%d")
+                act = self.profile_data.get("activity", {}) or {}
+                today_entry = act.get(today, {"questions": 0, "seconds": 0})
+                q = int(today_entry.get("questions", 0) or 0)
+                secs = int(today_entry.get("seconds", 0) or 0)
+                h = secs // 3600
+                m = (secs % 3600) // 60
+                if h > 0:
+                    timestr = f"{h}h {m}m"
+                else:
+                    timestr = f"{m}m"
+                self.profileTodaySummary.setText(f"Today: {q} questions — {timestr}")
+            except Exception:
+                self.profileTodaySummary.setText("")
         
-        for (system_name, drill_name), (lvl_lbl, bar, pct_lbl) in self.profileBuckets.items():
-            xp_value = int(self.profile_data["xp"].get(system_name, {}).get(drill_name, 0))
-            level, within, cap, pct = self.get_bucket_level_progress(xp_value)
-            lvl_lbl.setText(f"Level {level}")
-            bar.setRange(0, cap)
-            bar.setValue(within)
-            pct_lbl.setText(f"{pct}% ({within}/{cap})")
-        self.mainMenuUsername.setText(self.profile_data.get("username", "User"))
-        try:
-            pix = QPixmap(self.profile_data.get("pfp_path", resource_path("pfp.jpg"))).scaledToHeight(215, Qt.SmoothTransformation)
-            self.mainMenuPFP.setPixmap(pix)
-            self.mainMenuPFP.setFixedSize(pix.width(), pix.height())
-        except Exception:
-            pass
+            shown = self._profile_bucket_xp_shown
+            for key, (lvl_lbl, bar, pct_lbl) in self.profileBuckets.items():
+                system_name, drill_name = key
+                xp_value = int(self.profile_data["xp"].get(system_name, {}).get(drill_name, 0))
+                if shown.get(key) == xp_value:
+                    continue
+                shown[key] = xp_value
+                level, within, cap, pct = self.get_bucket_level_progress(xp_value)
+                lvl_lbl.setText(f"Level {level}")
+                bar.setRange(0, cap)
+                bar.setValue(within)
+                pct_lbl.setText(f"{pct}% ({within}/{cap})")
+            self.mainMenuUsername.setText(self.profile_data.get("username", "User"))
+            try:
+                pix = self._load_pfp()
+                self.mainMenuPFP.setPixmap(pix)
+                self.mainMenuPFP.setFixedSize(pix.width(), pix.height())
+            except Exception:
+                pass
+        finally:
+            page.setUpdatesEnabled(True)
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -2747,35 +3213,30 @@ class MainWindow(QMainWindow):
             if idx == 2:
                 self.stack.slide_to(1, "right")
                 return
-            r_idx = self.results_index()
-            if r_idx is not None and idx == r_idx:
+            if idx == self._results_page_index:
                 self.stack.slide_to(1, "right")
                 return
-            p_idx = self.profile_index()
-            if p_idx is not None and idx == p_idx:
+            if idx == self._profile_page_index:
                 self.stack.slide_to(0, "right")
                 return
 
         keys = {Qt.Key_1: 0, Qt.Key_2: 1, Qt.Key_3: 2, Qt.Key_4: 3}
-        if key in keys and hasattr(self, "answer_buttons"):
+        if key in keys:
             idx = keys[key]
             if idx < len(self.answer_buttons):
                 btn = self.answer_buttons[idx]
                 if btn is not None and btn.isEnabled():
-                    is_correct = (btn.text() == getattr(self, "correct_answer_text", ""))
-                    self.checkAnswer(is_correct, btn)
+                    self.checkAnswer(btn._is_correct, btn)
                     return
         if key in (Qt.Key_Return, Qt.Key_Enter):
-            r_idx = self.results_index()
-            if r_idx is not None and self.stack.currentIndex() == r_idx:
+            if self._results_page_index is not None and self.stack.currentIndex() == self._results_page_index:
                 btn = getattr(self, "_results_new_session_btn", None)
                 if btn is not None and btn.isEnabled():
                     btn.click()
                     return
 
         if key == Qt.Key_Backspace:
-            r_idx = self.results_index()
-            if r_idx is not None and self.stack.currentIndex() == r_idx:
+            if self._results_page_index is not None and self.stack.currentIndex() == self._results_page_index:
                 btn = getattr(self, "_results_repeat_failures_btn", None)
                 if btn is not None and btn.isEnabled():
                     btn.click()